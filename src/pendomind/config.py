@@ -1,13 +1,15 @@
 """Configuration management for PendoMind."""
 
 from dataclasses import dataclass, field
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import yaml
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ThresholdsConfig:
     """Quality score thresholds configuration."""
 
@@ -16,15 +18,16 @@ class ThresholdsConfig:
     duplicate_similarity: float = 0.90
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PendingConfig:
     """Pending item configuration."""
 
     ttl_minutes: int = 30
     cleanup_interval_seconds: int = 60
+    max_items: int = 1000
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TypesConfig:
     """Knowledge types configuration."""
 
@@ -39,10 +42,25 @@ class TypesConfig:
             "investigation",
         ]
     )
-    overrides: dict[str, dict[str, float]] = field(default_factory=dict)
+    # Read-only (overrides feed PendoMindConfig's cached per-type minimums):
+    # replace the section to change them
+    overrides: Mapping[str, Mapping[str, float]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Freeze overrides into read-only mappings."""
+        object.__setattr__(
+            self,
+            "overrides",
+            MappingProxyType(
+                {
+                    type_name: MappingProxyType(dict(settings))
+                    for type_name, settings in self.overrides.items()
+                }
+            ),
+        )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FilteringConfig:
     """Content filtering configuration."""
 
@@ -62,7 +80,7 @@ class FilteringConfig:
     max_content_length: int = 5000
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SourcesConfig:
     """Source credibility configuration."""
 
@@ -77,7 +95,7 @@ class SourcesConfig:
     )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QdrantConfig:
     """Qdrant connection configuration."""
 
@@ -86,7 +104,7 @@ class QdrantConfig:
     collection_name: str = "pendomind_knowledge"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScoringConfig:
     """Quality scoring configuration."""
 
@@ -129,9 +147,10 @@ class ScoringConfig:
             ],
         }
     )
+    cache_size: int = 4096
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EmbeddingsConfig:
     """Embedding configuration for FastEmbed.
 
@@ -142,11 +161,18 @@ class EmbeddingsConfig:
     model: str = "BAAI/bge-small-en-v1.5"
     dimensions: int = 384
     batch_size: int = 100
+    batch_wait_ms: int = 5
+    cache_size: int = 128
 
 
 @dataclass
 class PendoMindConfig:
-    """Main configuration for PendoMind."""
+    """Main configuration for PendoMind.
+
+    Sections are frozen (types.overrides is a read-only mapping); change
+    one by assigning a new section, e.g.
+    config.thresholds = replace(config.thresholds, min_quality_score=0.7).
+    """
 
     thresholds: ThresholdsConfig = field(default_factory=ThresholdsConfig)
     pending: PendingConfig = field(default_factory=PendingConfig)
@@ -156,6 +182,27 @@ class PendoMindConfig:
     qdrant: QdrantConfig = field(default_factory=QdrantConfig)
     scoring: ScoringConfig = field(default_factory=ScoringConfig)
     embeddings: EmbeddingsConfig = field(default_factory=EmbeddingsConfig)
+    # Per-type minimum scores (looked up on every remember), built on first
+    # use and dropped whenever the sections it derives from are replaced
+    _min_score_by_type: dict[str, float] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in ("thresholds", "types"):
+            object.__setattr__(self, "_min_score_by_type", None)
+
+    def _build_min_score_by_type(self) -> dict[str, float]:
+        """Flatten the default and per-type overrides into one lookup table."""
+        default = self.thresholds.min_quality_score
+        overrides = self.types.overrides
+        table = {
+            type_name: overrides.get(type_name, {}).get("min_quality_score", default)
+            for type_name in [*self.types.allowed, *overrides]
+        }
+        self._min_score_by_type = table
+        return table
 
     @classmethod
     def load(cls, path: Path | str = "config/quality_rules.yaml") -> "PendoMindConfig":
@@ -213,6 +260,7 @@ class PendoMindConfig:
             cleanup_interval_seconds=data.get(
                 "cleanup_interval_seconds", defaults.cleanup_interval_seconds
             ),
+            max_items=data.get("max_items", defaults.max_items),
         )
 
     @staticmethod
@@ -265,6 +313,7 @@ class PendoMindConfig:
         return ScoringConfig(
             weights=data.get("weights", defaults.weights),
             domain_keywords=data.get("domain_keywords", defaults.domain_keywords),
+            cache_size=data.get("cache_size", defaults.cache_size),
         )
 
     @staticmethod
@@ -275,6 +324,8 @@ class PendoMindConfig:
             model=data.get("model", defaults.model),
             dimensions=data.get("dimensions", defaults.dimensions),
             batch_size=data.get("batch_size", defaults.batch_size),
+            batch_wait_ms=data.get("batch_wait_ms", defaults.batch_wait_ms),
+            cache_size=data.get("cache_size", defaults.cache_size),
         )
 
     def get_min_score_for_type(self, type_name: str) -> float:
@@ -286,11 +337,10 @@ class PendoMindConfig:
         Returns:
             Minimum score threshold, using type override if defined
         """
-        if type_name in self.types.overrides:
-            override = self.types.overrides[type_name]
-            if "min_quality_score" in override:
-                return override["min_quality_score"]
-        return self.thresholds.min_quality_score
+        table = self._min_score_by_type
+        if table is None:
+            table = self._build_min_score_by_type()
+        return table.get(type_name, self.thresholds.min_quality_score)
 
     def get_source_credibility(self, source: str) -> float:
         """Get credibility score for a source.
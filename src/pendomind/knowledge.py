@@ -1,9 +1,12 @@
 """Knowledge base wrapper for Qdrant vector database."""
 
+import asyncio
 import hashlib
+from collections import OrderedDict
 from datetime import UTC, datetime
 from typing import Any
 
+import numpy as np
 from fastembed import TextEmbedding
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -27,6 +30,8 @@ class KnowledgeBase:
     - Semantic search with optional type filtering
     - Duplicate detection via similarity threshold
     - File path based retrieval
+    - LRU caching of recent embeddings
+    - Micro-batching of concurrent embedding requests
     """
 
     def __init__(self, config: PendoMindConfig | None = None):
@@ -47,6 +52,15 @@ class KnowledgeBase:
         # Model is downloaded from HuggingFace Hub on first use, then cached
         self._embedder = TextEmbedding(model_name=self.config.embeddings.model)
 
+        # Recent embeddings keyed by content digest, least recently used first.
+        # A find_similar -> remember round trip embeds the same text twice.
+        self._embedding_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+        # Pending (content, future) pairs for get_embedding_batched(), drained
+        # by a worker task that is started on demand and exits when idle.
+        self._embed_queue: asyncio.Queue | None = None
+        self._embed_worker: asyncio.Task | None = None
+
         # Ensure collection exists
         self._ensure_collection()
 
@@ -90,7 +104,7 @@ class KnowledgeBase:
         tags: list[str],
         source: str,
         file_paths: list[str] | None,
-        embedding: list[float],
+        embedding: list[float] | np.ndarray | bytes,
     ) -> str:
         """Store a knowledge entry in Qdrant.
 
@@ -102,11 +116,15 @@ class KnowledgeBase:
             tags: List of tags
             source: Source of the content (github, slack, etc.)
             file_paths: Related file paths (optional)
-            embedding: Pre-computed embedding vector
+            embedding: Pre-computed embedding vector (list, float32 array, or
+                raw float32 bytes)
 
         Returns:
             The point ID
         """
+        if isinstance(embedding, (bytes, bytearray, memoryview)):
+            embedding = np.frombuffer(embedding, dtype=np.float32)
+
         point_id = self._generate_id(content, source)
 
         payload = {
@@ -133,7 +151,7 @@ class KnowledgeBase:
 
     async def search(
         self,
-        embedding: list[float],
+        embedding: list[float] | np.ndarray,
         type_filter: str | None = None,
         limit: int = 10,
     ) -> list[dict[str, Any]]:
@@ -177,7 +195,7 @@ class KnowledgeBase:
 
     async def find_duplicates(
         self,
-        embedding: list[float],
+        embedding: list[float] | np.ndarray,
         threshold: float | None = None,
     ) -> list[dict[str, Any]]:
         """Find potential duplicates based on similarity.
@@ -287,21 +305,161 @@ class KnowledgeBase:
             for point in results
         ]
 
-    async def get_embedding(self, content: str) -> list[float]:
+    @staticmethod
+    def _embedding_key(content: str) -> bytes:
+        """Cache key for content (16-byte blake2b digest)."""
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _as_embedding(vector: Any) -> np.ndarray:
+        """Return vector as a read-only float32 array (no copy if already one).
+
+        Embeddings stay float32 end to end: PendingItem keeps them as arrays
+        and qdrant-client accepts them directly, so there is no round trip
+        through a list of Python floats.
+        """
+        # A view, so the model's own array is left writeable
+        embedding = np.asarray(vector, dtype=np.float32).view()
+        embedding.flags.writeable = False
+        return embedding
+
+    def _cached_embedding(self, key: bytes) -> np.ndarray | None:
+        """Look up a cached embedding, marking it as recently used."""
+        cached = self._embedding_cache.get(key)
+        if cached is not None:
+            self._embedding_cache.move_to_end(key)
+        return cached
+
+    def _cache_embedding(self, key: bytes, embedding: np.ndarray) -> None:
+        """Add an embedding to the LRU cache, evicting the oldest if full."""
+        self._embedding_cache[key] = embedding
+        if len(self._embedding_cache) > self.config.embeddings.cache_size:
+            self._embedding_cache.popitem(last=False)
+
+    async def get_embedding(self, content: str) -> np.ndarray:
         """Generate embedding for content using FastEmbed (runs locally).
 
         FastEmbed uses ONNX Runtime to run the model on your CPU.
         No API calls are made - everything happens locally.
 
+        Results are kept in a small LRU cache (embeddings.cache_size entries)
+        so embedding the same content again skips the model. The returned
+        array is shared with the cache and is therefore read-only.
+
         Args:
             content: Text to embed
 
         Returns:
-            Embedding vector (384 dimensions for bge-small-en-v1.5)
+            Embedding vector as a float32 array (384 dimensions for
+            bge-small-en-v1.5)
         """
-        # FastEmbed.embed() returns a generator, we need to convert to list
-        embeddings = list(self._embedder.embed([content]))
-        return embeddings[0].tolist()
+        key = self._embedding_key(content)
+        cached = self._cached_embedding(key)
+        if cached is not None:
+            return cached
+
+        # FastEmbed.embed() returns a generator of float32 arrays
+        embedding = self._as_embedding(next(iter(self._embedder.embed([content]))))
+
+        self._cache_embedding(key, embedding)
+        return embedding
+
+    async def get_embedding_batched(self, content: str) -> np.ndarray:
+        """Generate embedding, coalescing concurrent requests into one model call.
+
+        Requests arriving within embeddings.batch_wait_ms of each other are
+        embedded together (up to embeddings.batch_size texts per call), which
+        is much cheaper than one forward pass per text. Shares the LRU cache
+        with get_embedding().
+
+        Args:
+            content: Text to embed
+
+        Returns:
+            Embedding vector as a float32 array (384 dimensions for
+            bge-small-en-v1.5)
+        """
+        cached = self._cached_embedding(self._embedding_key(content))
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        if (
+            self._embed_worker is None
+            or self._embed_worker.done()
+            or self._embed_worker.get_loop() is not loop
+        ):
+            queue: asyncio.Queue = asyncio.Queue()
+            self._embed_queue = queue
+            self._embed_worker = loop.create_task(self._embed_batches(queue))
+            # Also covers a worker cancelled before it ever ran
+            self._embed_worker.add_done_callback(
+                lambda _: self._fail_requests(self._drain(queue))
+            )
+
+        future = loop.create_future()
+        self._embed_queue.put_nowait((content, future))
+        return await future
+
+    async def _embed_batches(self, queue: asyncio.Queue) -> None:
+        """Drain queued embedding requests in batches until the queue is idle.
+
+        A lone request is embedded straight away. The batch_wait_ms window
+        only applies once requests are already queuing up. If the worker is
+        cancelled or fails outside the model call, every request it still
+        holds fails instead of waiting forever.
+        """
+        batch_size = self.config.embeddings.batch_size
+        batch_wait = self.config.embeddings.batch_wait_ms / 1000
+        batch: list[tuple[str, asyncio.Future]] = []
+
+        try:
+            while not queue.empty():
+                # Give concurrent callers a short window to join this batch
+                if batch_wait > 0 and 1 < queue.qsize() < batch_size:
+                    await asyncio.sleep(batch_wait)
+
+                batch = []
+                while len(batch) < batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                # Identical texts in one batch only need embedding once
+                texts = list(dict.fromkeys(content for content, _ in batch))
+                try:
+                    vectors = list(self._embedder.embed(texts))
+                except Exception as exc:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(exc)
+                    continue
+
+                embeddings = {}
+                for text, vector in zip(texts, vectors):
+                    embeddings[text] = self._as_embedding(vector)
+                    self._cache_embedding(self._embedding_key(text), embeddings[text])
+
+                for content, future in batch:
+                    if not future.done():
+                        future.set_result(embeddings[content])
+        finally:
+            self._fail_requests(batch + self._drain(queue))
+
+    @staticmethod
+    def _drain(queue: asyncio.Queue) -> list[tuple[str, asyncio.Future]]:
+        """Take every request still waiting in the queue."""
+        requests = []
+        while not queue.empty():
+            requests.append(queue.get_nowait())
+        return requests
+
+    @staticmethod
+    def _fail_requests(requests: list[tuple[str, asyncio.Future]]) -> None:
+        """Fail requests the worker stopped before answering."""
+        for _, future in requests:
+            if not future.done():
+                future.set_exception(
+                    RuntimeError("Embedding worker stopped before this request")
+                )
 
     async def delete(self, point_id: str) -> None:
         """Delete a knowledge entry by ID.
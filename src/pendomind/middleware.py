@@ -1,15 +1,28 @@
 """Quality control middleware for PendoMind knowledge storage."""
 
+import re
+from bisect import bisect_right
 from dataclasses import dataclass
 from typing import Any
 
+try:
+    # Optional (pip install pendomind[fast]): Aho-Corasick automaton for the
+    # excluded-pattern scan; falls back to a compiled regex without it
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
 from pendomind.config import PendoMindConfig
 from pendomind.knowledge import KnowledgeBase
 from pendomind.quality import QualityScorer
-from pendomind.tools import PendingItem, PendingStore
+from pendomind.tools import PendingItem, PendingStore, shared_pending_store
+
+# Routing outcome for each band of the (min score, auto-approve) thresholds:
+# below the minimum, in between, and at or above auto-approve
+_ROUTES = ("rejected", "pending", "stored")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ValidationResult:
     """Result of a validation check."""
 
@@ -17,6 +30,10 @@ class ValidationResult:
     error: str | None = None
 
 
+# Immutable, so every passing check can share one instance
+_VALID = ValidationResult(is_valid=True)
+
+
 class QualityMiddleware:
     """Middleware for quality control of knowledge storage.
 
@@ -36,11 +53,43 @@ class QualityMiddleware:
         """
         self.config = config or PendoMindConfig()
 
+        # Allowed types as a set: validate_type() runs on every process() call
+        self._allowed_types = frozenset(self.config.types.allowed)
+
+        # Excluded patterns are matched in a single pass over the content:
+        # with an Aho-Corasick automaton when pyahocorasick is installed,
+        # otherwise as one regex alternation (longest patterns first, so an
+        # overlapping longer pattern wins). Both scan the lowercased content
+        # for the lowercased patterns: IGNORECASE would also match Unicode
+        # case folds ('ſecret') that str.lower() does not map to a pattern.
+        patterns = self.config.filtering.excluded_patterns
+        self._excluded_by_lower = {p.lower(): p for p in patterns}
+        self._excluded_automaton = None
+        self._excluded_re: re.Pattern[str] | None = None
+        if patterns and ahocorasick is not None:
+            self._excluded_automaton = ahocorasick.Automaton()
+            for lowered, pattern in self._excluded_by_lower.items():
+                self._excluded_automaton.add_word(lowered, pattern)
+            self._excluded_automaton.make_automaton()
+        elif patterns:
+            self._excluded_re = re.compile(
+                "|".join(
+                    re.escape(p)
+                    for p in sorted(self._excluded_by_lower, key=len, reverse=True)
+                )
+            )
+
         # These can be injected for testing
         self.scorer: QualityScorer | None = None
         self.kb: KnowledgeBase | None = None
         self.pending_store: PendingStore | None = None
 
+        self._route_handlers = {
+            "rejected": self._reject,
+            "pending": self._add_pending,
+            "stored": self._store,
+        }
+
     def validate_type(self, type_name: str) -> ValidationResult:
         """Validate that the knowledge type is allowed.
 
@@ -50,30 +99,44 @@ class QualityMiddleware:
         Returns:
             ValidationResult indicating pass/fail
         """
-        if type_name in self.config.types.allowed:
-            return ValidationResult(is_valid=True)
+        if type_name in self._allowed_types:
+            return _VALID
         return ValidationResult(
             is_valid=False,
             error=f"Invalid type '{type_name}'. Allowed types: {self.config.types.allowed}",
         )
 
-    def validate_content(self, content: str) -> ValidationResult:
+    def validate_content(
+        self, content: str, content_lower: str | None = None
+    ) -> ValidationResult:
         """Validate content doesn't contain excluded patterns.
 
         Args:
             content: The content to validate
+            content_lower: content.lower(), if the caller already has it
 
         Returns:
             ValidationResult indicating pass/fail
         """
-        content_lower = content.lower()
-        for pattern in self.config.filtering.excluded_patterns:
-            if pattern.lower() in content_lower:
-                return ValidationResult(
-                    is_valid=False,
-                    error=f"Content contains excluded pattern: '{pattern}'",
-                )
-        return ValidationResult(is_valid=True)
+        pattern = None
+        if self._excluded_automaton is not None:
+            if content_lower is None:
+                content_lower = content.lower()
+            for _, pattern in self._excluded_automaton.iter(content_lower):
+                break
+        elif self._excluded_re is not None:
+            if content_lower is None:
+                content_lower = content.lower()
+            match = self._excluded_re.search(content_lower)
+            if match:
+                pattern = self._excluded_by_lower[match.group(0)]
+
+        if pattern is not None:
+            return ValidationResult(
+                is_valid=False,
+                error=f"Content contains excluded pattern: '{pattern}'",
+            )
+        return _VALID
 
     def validate_length(self, content: str) -> ValidationResult:
         """Validate content length is within limits.
@@ -84,7 +147,11 @@ class QualityMiddleware:
         Returns:
             ValidationResult indicating pass/fail
         """
-        word_count = len(content.split())
+        max_words = self.config.filtering.max_content_length
+
+        # Split at most max_words times: over-long content yields max_words + 1
+        # pieces without building a list of every word
+        word_count = len(content.split(None, max_words))
 
         if word_count < self.config.filtering.min_content_length:
             return ValidationResult(
@@ -92,13 +159,13 @@ class QualityMiddleware:
                 error=f"Content too short ({word_count} words). Minimum: {self.config.filtering.min_content_length}",
             )
 
-        if word_count > self.config.filtering.max_content_length:
+        if word_count > max_words:
             return ValidationResult(
                 is_valid=False,
-                error=f"Content too long ({word_count} words). Maximum: {self.config.filtering.max_content_length}",
+                error=f"Content too long (over {max_words} words). Maximum: {max_words}",
             )
 
-        return ValidationResult(is_valid=True)
+        return _VALID
 
     async def process(
         self,
@@ -125,73 +192,130 @@ class QualityMiddleware:
         Returns:
             Dict with status and details
         """
-        # Step 1: Validate type
+        # Cheapest checks first, so most rejects never reach the pattern scan
+        # Step 1: Validate type (set lookup)
         type_result = self.validate_type(type)
         if not type_result.is_valid:
             return {"status": "rejected", "message": type_result.error}
 
-        # Step 2: Validate content patterns
-        content_result = self.validate_content(content)
-        if not content_result.is_valid:
-            return {"status": "rejected", "message": content_result.error}
-
-        # Step 3: Validate length
+        # Step 2: Validate length
         length_result = self.validate_length(content)
         if not length_result.is_valid:
             return {"status": "rejected", "message": length_result.error}
 
+        # Lowercase once for the pattern scan and the scorer
+        content_lower = content.lower()
+
+        # Step 3: Validate content patterns
+        content_result = self.validate_content(content, content_lower)
+        if not content_result.is_valid:
+            return {"status": "rejected", "message": content_result.error}
+
         # Initialize dependencies if not injected
         if self.scorer is None:
             self.scorer = QualityScorer(self.config)
         if self.kb is None:
             self.kb = KnowledgeBase(self.config)
         if self.pending_store is None:
-            self.pending_store = PendingStore(config=self.config)
-
-        # Step 4: Get embedding and check duplicates
-        embedding = await self.kb.get_embedding(content)
-        duplicates = await self.kb.find_duplicates(embedding)
+            # Shared with remember_confirm(), which must find the item
+            self.pending_store = shared_pending_store(self.config)
 
-        # Step 5: Calculate quality score
-        quality_analysis = await self.scorer.score(content, type, source)
+        # Step 4: Score quality
+        quality_analysis = await self.scorer.score(
+            content, type, source, content_lower=content_lower
+        )
         quality_score = quality_analysis.composite_score
 
-        # Step 6: Route based on quality score
+        # Step 5: Route based on quality score. bisect over the per-type
+        # (reject below, auto-approve from) table picks the band. A type
+        # minimum above auto-approve still rejects first, so clamp the
+        # table to stay sorted.
         min_threshold = self.config.get_min_score_for_type(type)
-        auto_approve_threshold = self.config.thresholds.auto_approve_score
-
-        if quality_score < min_threshold:
-            # Auto-reject
-            return {
-                "status": "rejected",
-                "message": f"Quality score {quality_score:.2f} below threshold {min_threshold:.2f}",
-                "quality_score": quality_score,
-                "quality_analysis": {
-                    "relevance": quality_analysis.relevance_score,
-                    "completeness": quality_analysis.completeness_score,
-                    "credibility": quality_analysis.credibility_score,
-                },
-                "recommendations": quality_analysis.recommendations,
-            }
-
-        if quality_score >= auto_approve_threshold:
-            # Auto-approve and store
-            point_id = await self.kb.store(
-                content=content,
-                type=type,
-                tags=tags,
-                source=source,
-                file_paths=file_paths,
-                embedding=embedding,
-            )
-            return {
-                "status": "stored",
-                "id": point_id,
-                "quality_score": quality_score,
-                "duplicates": duplicates if duplicates else None,
-            }
-
-        # Pending - requires confirmation
+        thresholds = (
+            min_threshold,
+            max(min_threshold, self.config.thresholds.auto_approve_score),
+        )
+        route = _ROUTES[bisect_right(thresholds, quality_score)]
+
+        # Step 6: Embed and check duplicates, only for entries that will be kept
+        embedding = None
+        duplicates = []
+        if route != "rejected":
+            embedding = await self.kb.get_embedding_batched(content)
+            duplicates = await self.kb.find_duplicates(embedding)
+
+        return await self._route_handlers[route](
+            content=content,
+            type=type,
+            tags=tags,
+            source=source,
+            file_paths=file_paths,
+            embedding=embedding,
+            duplicates=duplicates,
+            quality_analysis=quality_analysis,
+            min_threshold=min_threshold,
+        )
+
+    async def _reject(
+        self, *, quality_analysis: Any, min_threshold: float, **_: Any
+    ) -> dict[str, Any]:
+        """Auto-reject an entry scoring below the type's minimum."""
+        quality_score = quality_analysis.composite_score
+        return {
+            "status": "rejected",
+            "message": f"Quality score {quality_score:.2f} below threshold {min_threshold:.2f}",
+            "quality_score": quality_score,
+            "quality_analysis": {
+                "relevance": quality_analysis.relevance_score,
+                "completeness": quality_analysis.completeness_score,
+                "credibility": quality_analysis.credibility_score,
+            },
+            "recommendations": quality_analysis.recommendations,
+        }
+
+    async def _store(
+        self,
+        *,
+        content: str,
+        type: str,
+        tags: list[str],
+        source: str,
+        file_paths: list[str] | None,
+        embedding: Any,
+        duplicates: list[dict[str, Any]],
+        quality_analysis: Any,
+        **_: Any,
+    ) -> dict[str, Any]:
+        """Auto-approve a high-quality entry and store it."""
+        point_id = await self.kb.store(
+            content=content,
+            type=type,
+            tags=tags,
+            source=source,
+            file_paths=file_paths,
+            embedding=embedding,
+        )
+        return {
+            "status": "stored",
+            "id": point_id,
+            "quality_score": quality_analysis.composite_score,
+            "duplicates": duplicates if duplicates else None,
+        }
+
+    async def _add_pending(
+        self,
+        *,
+        content: str,
+        type: str,
+        tags: list[str],
+        source: str,
+        file_paths: list[str] | None,
+        embedding: Any,
+        duplicates: list[dict[str, Any]],
+        quality_analysis: Any,
+        **_: Any,
+    ) -> dict[str, Any]:
+        """Hold a medium-quality entry for user confirmation."""
         pending_item = PendingItem(
             id="",  # Will be generated
             content=content,
@@ -208,7 +332,7 @@ class QualityMiddleware:
         return {
             "status": "pending",
             "pending_id": pending_id,
-            "quality_score": quality_score,
+            "quality_score": quality_analysis.composite_score,
             "quality_analysis": {
                 "relevance": quality_analysis.relevance_score,
                 "completeness": quality_analysis.completeness_score,
@@ -1,11 +1,23 @@
 """Quality scoring system for PendoMind knowledge entries."""
 
-from dataclasses import dataclass, field
+import hashlib
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+try:
+    # Optional (pip install pendomind[fast]): one-pass marker scan for
+    # completeness; falls back to per-marker substring checks without it
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
 
 from pendomind.config import PendoMindConfig
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QualityAnalysis:
     """Result of quality analysis for a knowledge entry."""
 
@@ -33,6 +45,13 @@ class QualityScorer:
         "completeness": 0.35,
         "credibility": 0.25,
     }
+    # Same weights in (relevance, completeness, credibility) column order,
+    # for combining a batch of score rows column by column
+    _WEIGHT_COLUMNS = (
+        WEIGHTS["relevance"],
+        WEIGHTS["completeness"],
+        WEIGHTS["credibility"],
+    )
 
     # Source credibility rankings
     SOURCE_CREDIBILITY = {
@@ -43,6 +62,13 @@ class QualityScorer:
         "slack": 0.60,
     }
     DEFAULT_CREDIBILITY = 0.50
+    SOURCE_CREDIBILITY_DETAILS = {
+        "github": "High credibility: GitHub PRs/issues have code context and review",
+        "confluence": "Good credibility: Documented and reviewed content",
+        "jira": "Good credibility: Structured ticket with context",
+        "slack": "Lower credibility: Conversational, may lack full context",
+        "claude_session": "Moderate credibility: AI-assisted, should be verified",
+    }
 
     # Domain keywords for relevance scoring
     HIGH_RELEVANCE_KEYWORDS = [
@@ -81,6 +107,19 @@ class QualityScorer:
         "change",
     ]
 
+    # Error markers for technical content detection
+    ERROR_PATTERNS = ("error:", "exception:", "fatal", "error ")
+
+    # Type-specific relevance bonus: (bonus, markers); 0.1 when none match
+    TYPE_BONUS_MARKERS = {
+        "bug": (0.2, ("error", "traceback", "fix")),
+        "feature": (0.2, ("implement", "```", "feature")),
+        "incident": (0.25, ("rca", "root cause", "timeline")),
+        "debugging": (0.2, ("traceback", "debug", "stack")),
+        "architecture": (0.2, ("diagram", "service", "component")),
+        "error": (0.25, ("error:", "exception", "fatal")),
+    }
+
     # Structure markers for completeness
     STRUCTURE_MARKERS = {
         "problem": ["problem", "issue", "error", "bug", "symptom", "failing"],
@@ -118,6 +157,25 @@ class QualityScorer:
         """Initialize scorer with optional config."""
         self.config = config or PendoMindConfig()
 
+        # Recent analyses keyed by (content digest, type, source), least
+        # recently used first. Scoring is deterministic, so repeats are free.
+        self._score_cache: OrderedDict[tuple[bytes, str, str], QualityAnalysis] = (
+            OrderedDict()
+        )
+
+        # Structure and actionable markers in one automaton, so completeness
+        # finds every marker in a single pass over the content. Values are
+        # the structure section, or None for an actionable marker.
+        self._marker_automaton = None
+        if ahocorasick is not None:
+            self._marker_automaton = ahocorasick.Automaton()
+            for marker in self.ACTIONABLE_MARKERS:
+                self._marker_automaton.add_word(marker, (None, marker))
+            for section, markers in self.STRUCTURE_MARKERS.items():
+                for marker in markers:
+                    self._marker_automaton.add_word(marker, (section, marker))
+            self._marker_automaton.make_automaton()
+
     async def calculate_relevance(
         self, content: str, type_name: str
     ) -> tuple[float, str]:
@@ -130,16 +188,22 @@ class QualityScorer:
         Returns:
             Tuple of (score 0-1, explanation string)
         """
+        return self._relevance(content, content.lower(), type_name)
+
+    def _relevance(
+        self, content: str, content_lower: str, type_name: str
+    ) -> tuple[float, str]:
+        """calculate_relevance() on pre-lowered content."""
         score = 0.0
         factors = []
-        content_lower = content.lower()
 
-        # Keyword density (0-0.4)
+        # Keyword density (0-0.4). Keywords are lowercase literals, so plain
+        # substring checks against the lowered content are enough.
         high_matches = sum(
-            1 for kw in self.HIGH_RELEVANCE_KEYWORDS if kw.lower() in content_lower
+            1 for kw in self.HIGH_RELEVANCE_KEYWORDS if kw in content_lower
         )
         medium_matches = sum(
-            1 for kw in self.MEDIUM_RELEVANCE_KEYWORDS if kw.lower() in content_lower
+            1 for kw in self.MEDIUM_RELEVANCE_KEYWORDS if kw in content_lower
         )
 
         keyword_score = min(high_matches * 0.08 + medium_matches * 0.04, 0.4)
@@ -152,9 +216,7 @@ class QualityScorer:
         # Code/technical content detection (0-0.3)
         has_code_block = "```" in content or "    " in content
         has_stack_trace = "traceback" in content_lower or "at " in content_lower
-        has_error_pattern = any(
-            p in content_lower for p in ["error:", "exception:", "fatal", "error "]
-        )
+        has_error_pattern = any(p in content_lower for p in self.ERROR_PATTERNS)
 
         technical_score = 0.0
         if has_code_block:
@@ -178,27 +240,12 @@ class QualityScorer:
 
     def _get_type_bonus(self, content_lower: str, type_name: str) -> float:
         """Calculate type-specific relevance bonus."""
-        bonuses = {
-            "bug": 0.2
-            if any(kw in content_lower for kw in ["error", "traceback", "fix"])
-            else 0.1,
-            "feature": 0.2
-            if any(kw in content_lower for kw in ["implement", "```", "feature"])
-            else 0.1,
-            "incident": 0.25
-            if any(kw in content_lower for kw in ["rca", "root cause", "timeline"])
-            else 0.1,
-            "debugging": 0.2
-            if any(kw in content_lower for kw in ["traceback", "debug", "stack"])
-            else 0.1,
-            "architecture": 0.2
-            if any(kw in content_lower for kw in ["diagram", "service", "component"])
-            else 0.1,
-            "error": 0.25
-            if any(kw in content_lower for kw in ["error:", "exception", "fatal"])
-            else 0.1,
-        }
-        return bonuses.get(type_name, 0.1)
+        # Only the requested type's markers are scanned
+        bonus_markers = self.TYPE_BONUS_MARKERS.get(type_name)
+        if bonus_markers is None:
+            return 0.1
+        bonus, markers = bonus_markers
+        return bonus if any(kw in content_lower for kw in markers) else 0.1
 
     async def calculate_completeness(
         self, content: str, type_name: str
@@ -212,13 +259,15 @@ class QualityScorer:
         Returns:
             Tuple of (score 0-1, explanation string)
         """
+        return self._completeness(content.lower(), len(content.split()))
+
+    def _completeness(self, content_lower: str, word_count: int) -> tuple[float, str]:
+        """calculate_completeness() on pre-lowered, pre-counted content."""
         score = 0.0
         present = []
         missing = []
-        content_lower = content.lower()
 
         # Length check (0-0.25)
-        word_count = len(content.split())
         if word_count < 20:
             score += 0.05
             missing.append("Very short content (<20 words)")
@@ -232,10 +281,12 @@ class QualityScorer:
             score += 0.25
             present.append("Detailed content (150+ words)")
 
+        sections, actionable_count = self._find_markers(content_lower)
+
         # Structure check (0-0.35)
         sections_found = 0
-        for section, markers in self.STRUCTURE_MARKERS.items():
-            if any(m.lower() in content_lower for m in markers):
+        for section in self.STRUCTURE_MARKERS:
+            if section in sections:
                 sections_found += 1
                 present.append(f"Has {section}")
             else:
@@ -245,9 +296,6 @@ class QualityScorer:
         score += structure_score
 
         # Actionability check (0-0.40)
-        actionable_count = sum(
-            1 for m in self.ACTIONABLE_MARKERS if m.lower() in content_lower
-        )
         actionable_score = min(actionable_count * 0.08, 0.40)
         score += actionable_score
 
@@ -259,6 +307,30 @@ class QualityScorer:
         explanation = f"Present: {', '.join(present)}. Missing: {', '.join(missing)}"
         return min(score, 1.0), explanation
 
+    def _find_markers(self, content_lower: str) -> tuple[set[str], int]:
+        """Return the structure sections present and the number of distinct
+        actionable markers in pre-lowered content.
+        """
+        if self._marker_automaton is None:
+            sections = {
+                section
+                for section, markers in self.STRUCTURE_MARKERS.items()
+                if any(m in content_lower for m in markers)
+            }
+            actionable_count = sum(
+                1 for m in self.ACTIONABLE_MARKERS if m in content_lower
+            )
+            return sections, actionable_count
+
+        sections = set()
+        actionable = set()
+        for _, (section, marker) in self._marker_automaton.iter(content_lower):
+            if section is None:
+                actionable.add(marker)
+            else:
+                sections.add(section)
+        return sections, len(actionable)
+
     async def calculate_credibility(self, source: str) -> tuple[float, str]:
         """Calculate credibility score for a source.
 
@@ -269,19 +341,17 @@ class QualityScorer:
             Tuple of (score 0-1, explanation string)
         """
         score = self.SOURCE_CREDIBILITY.get(source, self.DEFAULT_CREDIBILITY)
-
-        explanations = {
-            "github": "High credibility: GitHub PRs/issues have code context and review",
-            "confluence": "Good credibility: Documented and reviewed content",
-            "jira": "Good credibility: Structured ticket with context",
-            "slack": "Lower credibility: Conversational, may lack full context",
-            "claude_session": "Moderate credibility: AI-assisted, should be verified",
-        }
-
-        return score, explanations.get(source, f"Unknown source ({source})")
+        explanation = self.SOURCE_CREDIBILITY_DETAILS.get(source)
+        if explanation is None:
+            explanation = f"Unknown source ({source})"
+        return score, explanation
 
     async def score(
-        self, content: str, type_name: str, source: str
+        self,
+        content: str,
+        type_name: str,
+        source: str,
+        content_lower: str | None = None,
     ) -> QualityAnalysis:
         """Calculate composite quality score with recommendations.
 
@@ -289,23 +359,155 @@ class QualityScorer:
             content: The knowledge content to score
             type_name: Knowledge type (bug, feature, etc.)
             source: Source of the content (github, slack, etc.)
+            content_lower: content.lower(), if the caller already has it
 
         Returns:
             QualityAnalysis with all scores and recommendations
         """
-        relevance, rel_details = await self.calculate_relevance(content, type_name)
-        completeness, comp_details = await self.calculate_completeness(
-            content, type_name
-        )
-        credibility, cred_details = await self.calculate_credibility(source)
+        return (
+            await self.score_batch(
+                [content],
+                [type_name],
+                [source],
+                contents_lower=None if content_lower is None else [content_lower],
+            )
+        )[0]
+
+    async def score_batch(
+        self,
+        contents: Sequence[str],
+        type_names: Sequence[str],
+        sources: Sequence[str],
+        contents_lower: Sequence[str] | None = None,
+    ) -> list[QualityAnalysis]:
+        """Score several entries, combining their factor scores per batch.
+
+        The three factor scores are computed per entry, then stacked into an
+        (N, 3) array and weighted with one vectorized pass per column.
+        Entries scored recently are served from an LRU cache
+        (scoring.cache_size entries).
+
+        Args:
+            contents: The knowledge contents to score
+            type_names: Knowledge type for each content
+            sources: Source for each content
+            contents_lower: Lowercased contents, if the caller already has them
 
-        composite = (
-            relevance * self.WEIGHTS["relevance"]
-            + completeness * self.WEIGHTS["completeness"]
-            + credibility * self.WEIGHTS["credibility"]
+        Returns:
+            One QualityAnalysis per content, in input order
+        """
+        if not len(contents) == len(type_names) == len(sources):
+            raise ValueError(
+                "contents, type_names and sources must be the same length"
+            )
+
+        keys = [
+            (self._content_key(content), type_name, source)
+            for content, type_name, source in zip(contents, type_names, sources)
+        ]
+        results: list[QualityAnalysis | None] = [
+            self._cached_score(key) for key in keys
+        ]
+        misses = [i for i, analysis in enumerate(results) if analysis is None]
+        if misses:
+            scored = await self._score_uncached(
+                [contents[i] for i in misses],
+                [type_names[i] for i in misses],
+                [sources[i] for i in misses],
+                None if contents_lower is None else [contents_lower[i] for i in misses],
+            )
+            for i, analysis in zip(misses, scored):
+                self._cache_score(keys[i], analysis)
+                results[i] = analysis
+
+        # Callers get their own recommendations list, not the cached one
+        return [
+            replace(analysis, recommendations=list(analysis.recommendations))
+            for analysis in results
+        ]
+
+    @staticmethod
+    def _content_key(content: str) -> bytes:
+        """Cache key for content (16-byte blake2b digest)."""
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    def _cached_score(self, key: tuple[bytes, str, str]) -> QualityAnalysis | None:
+        """Look up a cached analysis, marking it as recently used."""
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            self._score_cache.move_to_end(key)
+        return cached
+
+    def _cache_score(
+        self, key: tuple[bytes, str, str], analysis: QualityAnalysis
+    ) -> None:
+        """Add an analysis to the LRU cache, evicting the oldest if full."""
+        self._score_cache[key] = analysis
+        if len(self._score_cache) > self.config.scoring.cache_size:
+            self._score_cache.popitem(last=False)
+
+    async def _score_uncached(
+        self,
+        contents: Sequence[str],
+        type_names: Sequence[str],
+        sources: Sequence[str],
+        contents_lower: Sequence[str] | None = None,
+    ) -> list[QualityAnalysis]:
+        """score_batch() without the cache."""
+        if contents_lower is None:
+            contents_lower = [content.lower() for content in contents]
+
+        factors = np.empty((len(contents), 3))
+        details = []
+        word_counts = []
+        for i, (content, content_lower, type_name, source) in enumerate(
+            zip(contents, contents_lower, type_names, sources)
+        ):
+            # Tokenize once; every factor reuses the word count
+            word_count = len(content.split())
+
+            relevance, rel_details = self._relevance(content, content_lower, type_name)
+            completeness, comp_details = self._completeness(content_lower, word_count)
+            credibility, _ = await self.calculate_credibility(source)
+            factors[i] = (relevance, completeness, credibility)
+            details.append((rel_details, comp_details))
+            word_counts.append(word_count)
+
+        # Weight column by column, adding in the same order as the scalar
+        # formula: a matrix-vector product sums differently and can move a
+        # composite across a rounding boundary (0.645 vs 0.6449...). This is
+        # five elementwise NumPy ops per batch; scoring time goes to the
+        # per-entry string scans above, so a compiled kernel wouldn't help.
+        w_rel, w_comp, w_cred = self._WEIGHT_COLUMNS
+        composites = (
+            factors[:, 0] * w_rel + factors[:, 1] * w_comp + factors[:, 2] * w_cred
         )
 
-        # Generate recommendations
+        analyses = []
+        for word_count, row, composite, (rel_details, comp_details) in zip(
+            word_counts, factors.tolist(), composites.tolist(), details
+        ):
+            relevance, completeness, credibility = row
+            analyses.append(
+                QualityAnalysis(
+                    relevance_score=round(relevance, 2),
+                    completeness_score=round(completeness, 2),
+                    credibility_score=round(credibility, 2),
+                    composite_score=round(composite, 2),
+                    relevance_details=rel_details,
+                    completeness_details=comp_details,
+                    recommendations=self._recommendations(
+                        word_count, relevance, completeness, credibility
+                    ),
+                )
+            )
+        return analyses
+
+    @staticmethod
+    def _recommendations(
+        word_count: int, relevance: float, completeness: float, credibility: float
+    ) -> list[str]:
+        """Suggest improvements for the factors that scored low."""
         recommendations = []
         if relevance < 0.6:
             recommendations.append(
@@ -317,15 +519,6 @@ class QualityScorer:
             recommendations.append(
                 "Consider adding references to GitHub PRs or documentation"
             )
-        if len(content.split()) < 50:
+        if word_count < 50:
             recommendations.append("Expand content with more context and details")
-
-        return QualityAnalysis(
-            relevance_score=round(relevance, 2),
-            completeness_score=round(completeness, 2),
-            credibility_score=round(credibility, 2),
-            composite_score=round(composite, 2),
-            relevance_details=rel_details,
-            completeness_details=comp_details,
-            recommendations=recommendations,
-        )
+        return recommendations
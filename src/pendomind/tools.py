@@ -1,11 +1,18 @@
 """MCP tools and PendingStore for PendoMind knowledge base."""
 
+import asyncio
+import heapq
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from typing import Any
 
-from pendomind.config import PendoMindConfig
+import numpy as np
+
+from pendomind.config import PendingConfig, PendoMindConfig
 
 
 def _utc_now() -> datetime:
@@ -13,12 +20,27 @@ def _utc_now() -> datetime:
     return datetime.now(UTC)
 
 
-@dataclass
+# TTL assumed by a PendingItem until a PendingStore applies its own
+DEFAULT_TTL_MINUTES = 30
+
+
+@dataclass(slots=True)
 class PendingItem:
     """A pending knowledge entry awaiting user confirmation.
 
     Items in the "pending" state have quality scores between 0.65-0.85
     and require explicit user approval before storage.
+
+    The embedding is held as a contiguous float32 array rather than a list
+    of Python floats, and is handed to KnowledgeBase.store() unchanged.
+    Raw float32 bytes (or any buffer) are accepted and wrapped without a copy.
+
+    created_at (wall clock) is kept for display. Expiry runs on the
+    time.monotonic() clock, so wall-clock steps (NTP, DST mistakes) can't
+    expire items early or keep them alive: created_at is mapped onto that
+    clock once at construction, and expires_at is the monotonic time at
+    which the item expires (DEFAULT_TTL_MINUTES until PendingStore.add()
+    applies the store's TTL), so expiry checks are a float compare.
     """
 
     id: str
@@ -27,27 +49,41 @@ class PendingItem:
     tags: list[str]
     source: str
     file_paths: list[str] | None
-    embedding: list[float]
+    # Excluded from ==: comparing arrays elementwise has no single truth value
+    embedding: np.ndarray = field(compare=False)
     quality_analysis: Any  # QualityAnalysis or mock
     duplicate_info: dict[str, Any] | None = None
     created_at: datetime = field(default_factory=_utc_now)
+    _created_monotonic: float = field(init=False, repr=False, compare=False)
+    expires_at: float = field(init=False, repr=False, compare=False)
 
-    def is_expired(self, ttl_minutes: int = 30) -> bool:
+    def __post_init__(self) -> None:
+        """Treat a naive created_at as UTC, place it on the monotonic clock,
+        derive expires_at, and normalize the embedding to a float32 array
+        (no copy if already one).
+        """
+        if self.created_at.tzinfo is None:
+            self.created_at = self.created_at.replace(tzinfo=UTC)
+        age = time.time() - self.created_at.timestamp()
+        self._created_monotonic = time.monotonic() - age
+        self.expires_at = self._created_monotonic + DEFAULT_TTL_MINUTES * 60
+        if isinstance(self.embedding, (bytes, bytearray, memoryview)):
+            self.embedding = np.frombuffer(self.embedding, dtype=np.float32)
+        else:
+            self.embedding = np.asarray(self.embedding, dtype=np.float32)
+
+    def is_expired(self, ttl_minutes: int | None = None) -> bool:
         """Check if this pending item has expired.
 
         Args:
-            ttl_minutes: Time-to-live in minutes
+            ttl_minutes: Time-to-live in minutes (default: use expires_at)
 
         Returns:
             True if item is past TTL, False otherwise
         """
-        # Handle both timezone-aware and naive datetimes
-        now = _utc_now()
-        if self.created_at.tzinfo is None:
-            # If created_at is naive, make comparison in naive UTC
-            now = now.replace(tzinfo=None)
-        expiry_time = self.created_at + timedelta(minutes=ttl_minutes)
-        return now > expiry_time
+        if ttl_minutes is None:
+            return time.monotonic() > self.expires_at
+        return time.monotonic() > self._created_monotonic + ttl_minutes * 60
 
 
 class PendingStore:
@@ -60,18 +96,50 @@ class PendingStore:
     - Pending items are transient by design
     - User should confirm promptly while context is fresh
     - No need to survive restarts
+
+    Every item's expiry time also goes into a min-heap. cleanup_expired(),
+    count() and list_pending() pop only the entries that have come due, so
+    their expiry work scales with the number of expired items rather than
+    the store size; when the earliest deadline is still ahead they do no
+    expiry work at all. get() also checks expiry lazily. Once the store
+    grows past SWEEP_THRESHOLD items, a background task also drains the
+    heap, waking when the next item is due, so large stores don't wait for
+    a read to shed them.
+
+    The store holds at most max_items entries. Adding beyond that evicts
+    the least recently used item (added or read longest ago), so sustained
+    remember traffic can't grow it without bound.
+
+    get() and remove() take no lock: each OrderedDict call they make
+    (get, pop, move_to_end) is atomic, but get() makes more than one, so
+    an item can vanish between them. add() and the multi-step scans that
+    delete expired items hold an internal lock, so the heap stays
+    consistent and concurrent cleanups can't race each other. Because
+    lock-free readers can still reorder or pop entries, locked code never
+    iterates _items directly; it takes a list() snapshot first. Scans
+    peek at the heap top without the lock and skip it when nothing is due.
     """
 
+    # Background sweep settings
+    SWEEP_THRESHOLD = 256
+    SWEEP_TICK_MS = 50
+
     def __init__(
-        self, ttl_minutes: int | None = None, config: PendoMindConfig | None = None
+        self,
+        ttl_minutes: int | None = None,
+        config: PendoMindConfig | None = None,
+        max_items: int | None = None,
     ):
         """Initialize the pending store.
 
         Args:
             ttl_minutes: Override TTL (optional)
-            config: PendoMindConfig for default TTL (optional)
+            config: PendoMindConfig for default TTL and size cap (optional)
+            max_items: Override the size cap (optional)
         """
-        self._items: dict[str, PendingItem] = {}
+        # Least recently used first
+        self._items: OrderedDict[str, PendingItem] = OrderedDict()
+        self._lock = threading.Lock()  # Guards multi-step expiry scans only
 
         # Determine TTL: explicit > config > default
         if ttl_minutes is not None:
@@ -81,6 +149,19 @@ class PendingStore:
         else:
             self.ttl_minutes = 30  # Default
 
+        # Determine size cap: explicit > config > default
+        if max_items is not None:
+            self.max_items = max_items
+        elif config is not None:
+            self.max_items = config.pending.max_items
+        else:
+            self.max_items = 1000  # Default
+
+        # Min-heap of (expires_at, item ID). Entries for removed or re-added
+        # items are skipped when they reach the top (lazy deletion).
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._sweep_task: asyncio.Task | None = None
+
     def add(self, item: PendingItem) -> str:
         """Add a pending item to the store.
 
@@ -94,7 +175,31 @@ class PendingStore:
         if not item.id:
             item.id = f"pending-{uuid.uuid4().hex[:12]}"
 
-        self._items[item.id] = item
+        # Expiry under this store's TTL
+        item.expires_at = item._created_monotonic + self.ttl_minutes * 60
+
+        with self._lock:
+            self._items[item.id] = item
+            self._items.move_to_end(item.id)
+            heapq.heappush(self._expiry_heap, (item.expires_at, item.id))
+
+            # Evict least recently used items; their heap entries go stale
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+            # Rebuild once stale entries (removed items) dominate the heap.
+            # Snapshot first: lock-free get()/remove() may reorder or pop
+            # _items while the comprehension runs.
+            if len(self._expiry_heap) > 2 * len(self._items) + 64:
+                self._expiry_heap = [
+                    (pending.expires_at, pending_id)
+                    for pending_id, pending in list(self._items.items())
+                ]
+                heapq.heapify(self._expiry_heap)
+
+        if self._sweep_task is None and len(self._items) > self.SWEEP_THRESHOLD:
+            self._start_sweep()
+
         return item.id
 
     def get(self, item_id: str) -> PendingItem | None:
@@ -113,11 +218,16 @@ class PendingStore:
             return None
 
         # Check if expired
-        if item.is_expired(self.ttl_minutes):
-            # Auto-cleanup expired item
-            del self._items[item_id]
+        if item.is_expired():
+            # Auto-cleanup expired item (pop: a cleanup may have beaten us)
+            self._items.pop(item_id, None)
             return None
 
+        try:
+            self._items.move_to_end(item_id)  # Mark as recently used
+        except KeyError:
+            pass  # Removed concurrently; still return what we read
+
         return item
 
     def remove(self, item_id: str) -> bool:
@@ -129,10 +239,7 @@ class PendingStore:
         Returns:
             True if item was removed, False if not found
         """
-        if item_id in self._items:
-            del self._items[item_id]
-            return True
-        return False
+        return self._items.pop(item_id, None) is not None
 
     def list_pending(self) -> list[PendingItem]:
         """List all non-expired pending items.
@@ -140,20 +247,10 @@ class PendingStore:
         Returns:
             List of valid pending items
         """
-        valid_items = []
-        expired_ids = []
-
-        for item_id, item in self._items.items():
-            if item.is_expired(self.ttl_minutes):
-                expired_ids.append(item_id)
-            else:
-                valid_items.append(item)
-
-        # Cleanup expired items
-        for item_id in expired_ids:
-            del self._items[item_id]
-
-        return valid_items
+        if self._has_due():
+            with self._lock:
+                self._expire_due()
+        return list(self._items.values())  # snapshot; safe without the lock
 
     def cleanup_expired(self) -> int:
         """Remove all expired items from the store.
@@ -161,16 +258,74 @@ class PendingStore:
         Returns:
             Number of items removed
         """
-        expired_ids = [
-            item_id
-            for item_id, item in self._items.items()
-            if item.is_expired(self.ttl_minutes)
-        ]
+        if not self._has_due():
+            return 0  # Skip the lock: nothing has come due
 
-        for item_id in expired_ids:
-            del self._items[item_id]
+        with self._lock:
+            return self._expire_due()
 
-        return len(expired_ids)
+    def _has_due(self) -> bool:
+        """Whether the earliest pending expiry has passed.
+
+        A lock-free peek at the heap top. It may be momentarily stale under
+        concurrent adds, which at worst defers removal to the next call.
+        """
+        try:
+            return self._expiry_heap[0][0] < time.monotonic()
+        except IndexError:
+            return False
+
+    def _expire_due(self) -> int:
+        """Pop every heap entry that has come due, dropping its item.
+
+        Stale entries (the item was removed, or re-added with a new expiry)
+        are discarded. Must be called with the lock held.
+
+        Returns:
+            Number of items removed
+        """
+        heap = self._expiry_heap
+        now = time.monotonic()
+        removed = 0
+
+        while heap and heap[0][0] < now:
+            expires_at, item_id = heapq.heappop(heap)
+            item = self._items.get(item_id)
+            if item is not None and item.expires_at == expires_at:
+                # pop: a lock-free remove() may have beaten us
+                if self._items.pop(item_id, None) is not None:
+                    removed += 1
+
+        return removed
+
+    def _start_sweep(self) -> None:
+        """Start the background sweep if an event loop is running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (sync caller) - lazy expiry still applies
+
+        self._sweep_task = loop.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        """Drop expired items in batches while the store is large.
+
+        Instead of waking every tick, the loop sleeps until the earliest
+        pending expiry (but at least SWEEP_TICK_MS), so items expiring
+        close together go in one locked pass. The loop stops once the store
+        shrinks back below SWEEP_THRESHOLD.
+        """
+        min_delay = self.SWEEP_TICK_MS / 1000
+        try:
+            while len(self._items) > self.SWEEP_THRESHOLD:
+                try:
+                    next_expiry = self._expiry_heap[0][0]
+                except IndexError:
+                    next_expiry = 0.0
+                await asyncio.sleep(max(min_delay, next_expiry - time.monotonic()))
+                self.cleanup_expired()
+        finally:
+            self._sweep_task = None
 
     def count(self) -> int:
         """Count non-expired pending items.
@@ -178,16 +333,44 @@ class PendingStore:
         Returns:
             Number of valid pending items
         """
-        return sum(
-            1
-            for item in self._items.values()
-            if not item.is_expired(self.ttl_minutes)
-        )
+        if self._has_due():
+            with self._lock:
+                self._expire_due()
+        return len(self._items)
 
 
 # --------------------------------------------------------------------------
 # MCP Tools
 # --------------------------------------------------------------------------
+# Shared stores, one per pending config section (TTL and size cap)
+_shared_pending_stores: dict[PendingConfig, PendingStore] = {}
+
+
+def shared_pending_store(config: PendoMindConfig | None = None) -> PendingStore:
+    """Get the process-wide PendingStore for a configuration.
+
+    Items must be confirmed against the same store that created them, so
+    callers without an explicit store share one store per pending config
+    section: the middleware's lazy store and remember_confirm() meet in the
+    same place, and a custom config still gets its own TTL and size cap.
+
+    Args:
+        config: Configuration whose pending settings the store uses
+            (default: PendoMindConfig())
+
+    Returns:
+        The shared PendingStore for config.pending
+    """
+    if config is None:
+        config = PendoMindConfig()
+    store = _shared_pending_stores.get(config.pending)
+    if store is None:
+        store = _shared_pending_stores.setdefault(
+            config.pending, PendingStore(config=config)
+        )
+    return store
+
+
 # These functions are the MCP tool implementations that will be exposed via
 # FastMCP decorators in main.py. They accept optional dependency injection
 # for testing purposes.
@@ -217,7 +400,7 @@ async def search(
         kb = KnowledgeBase()
 
     # Generate embedding for query
-    embedding = await kb.get_embedding(query)
+    embedding = await kb.get_embedding_batched(query)
 
     # Search knowledge base
     results = await kb.search(embedding, type_filter=type_filter, limit=limit)
@@ -288,7 +471,7 @@ async def remember_confirm(
     """
     # Lazy imports
     if pending_store is None:
-        pending_store = PendingStore()
+        pending_store = shared_pending_store()
     if kb is None:
         from pendomind.knowledge import KnowledgeBase
 
@@ -345,7 +528,7 @@ async def recall(
 
         kb = KnowledgeBase()
 
-    embedding = await kb.get_embedding(query)
+    embedding = await kb.get_embedding_batched(query)
     results = await kb.search(embedding, type_filter=type_filter, limit=limit)
 
     return {"entries": results, "query": query, "count": len(results)}
@@ -373,7 +556,7 @@ async def list_similar(
 
         kb = KnowledgeBase()
 
-    embedding = await kb.get_embedding(content)
+    embedding = await kb.get_embedding_batched(content)
     duplicates = await kb.find_duplicates(embedding, threshold=threshold)
 
     return duplicates
@@ -426,22 +609,30 @@ async def list_all(
 
     entries = await kb.get_all(type_filter=type_filter, limit=limit)
 
-    return [
-        {
-            "id": entry["id"],
-            "type": entry.get("type"),
-            "summary": (
-                entry.get("content", "")[:150] + "..."
-                if len(entry.get("content", "")) > 150
-                else entry.get("content", "")
-            ),
-            "tags": entry.get("tags", []),
-            "source": entry.get("source"),
-            "file_paths": entry.get("file_paths"),
-            "created_at": entry.get("created_at"),
-        }
-        for entry in entries
-    ]
+    # Plain loop with a local dict.get alias: content is looked up once per
+    # entry instead of three times, and .get isn't re-resolved each call.
+    max_chars = 150
+    _get = dict.get
+    results = []
+    for entry in entries:
+        content = _get(entry, "content", "")
+        results.append(
+            {
+                "id": entry["id"],
+                "type": _get(entry, "type"),
+                "summary": (
+                    content[:max_chars] + "..."
+                    if len(content) > max_chars
+                    else content
+                ),
+                "tags": _get(entry, "tags", []),
+                "source": _get(entry, "source"),
+                "file_paths": _get(entry, "file_paths"),
+                "created_at": _get(entry, "created_at"),
+            }
+        )
+
+    return results
 
 
 async def update(
@@ -542,7 +733,7 @@ async def upsert(
         kb = KnowledgeBase()
 
     # Generate embedding for the new content
-    embedding = await kb.get_embedding(content)
+    embedding = await kb.get_embedding_batched(content)
 
     # Search for similar existing entries
     similar = await kb.find_duplicates(embedding, threshold=similarity_threshold)
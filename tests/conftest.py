@@ -1,9 +1,28 @@
 """Shared test fixtures for PendoMind."""
 
+import asyncio
+
+import numpy as np
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, AsyncMock
 
+from tests.fakes import FakeQdrant
+
+# Shared mock embedding (bge-small-en-v1.5 dimensions), read-only so tests
+# can't modify it for each other
+_MOCK_EMBEDDING = np.full(384, 0.1, dtype=np.float32)
+_MOCK_EMBEDDING.setflags(write=False)
+
+# Embedder methods KnowledgeBase actually calls; anything else on the
+# session mock raises AttributeError instead of silently returning a mock
+_EMBED_SPEC = ["embed"]
+
+
+def _fake_embed(texts, *args, **kwargs):
+    """FastEmbed stand-in: one shared embedding per input text."""
+    return iter([_MOCK_EMBEDDING] * len(texts))
+
 
 @pytest.fixture
 def sample_bug_content():
@@ -68,10 +87,13 @@ def sample_incident_content():
     """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_embedding():
-    """Mock FastEmbed embedding vector (384 dimensions for bge-small-en-v1.5)."""
-    return [0.1] * 384
+    """Mock FastEmbed embedding vector (384 dimensions for bge-small-en-v1.5).
+
+    The shared read-only float32 array, so tests don't rebuild it.
+    """
+    return _MOCK_EMBEDDING
 
 
 @pytest.fixture
@@ -138,3 +160,146 @@ def mock_duplicate_info():
     info.duplicates = []
     info.recommendation = "store"
     return info
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _mock_services_template(session_mocker):
+    """Patch Qdrant and FastEmbed once for the whole session.
+
+    No test talks to a real Qdrant server or downloads a model. The patched
+    classes always hand out the same FakeQdrant client and embedder mock, and
+    mock_external_services resets them before each test. Tests that patch
+    these classes themselves simply shadow the session patch. pytest-mock's
+    session_mocker undoes the patches at session end.
+    """
+    mock_qdrant = session_mocker.patch("pendomind.knowledge.QdrantClient")
+    mock_fastembed = session_mocker.patch("pendomind.knowledge.TextEmbedding")
+    mock_qdrant.return_value = FakeQdrant()
+
+    # One embedder for the session - KnowledgeBase() never builds a new one
+    mock_embedder = MagicMock(spec=_EMBED_SPEC)
+    mock_embedder.embed.side_effect = _fake_embed
+    mock_fastembed.return_value = mock_embedder
+
+    return {
+        "qdrant": mock_qdrant.return_value,
+        "fastembed": mock_embedder,
+    }
+
+
+@pytest.fixture
+def mock_external_services(_mock_services_template):
+    """Fake Qdrant client and FastEmbed mock, reset to an empty knowledge base
+    per test.
+    """
+    fake_qdrant = _mock_services_template["qdrant"]
+    mock_embedder = _mock_services_template["fastembed"]
+    fake_qdrant.reset()
+
+    # Clear call history only; restore the default behaviour in case a test
+    # overrode it
+    mock_embedder.embed.reset_mock()
+    mock_embedder.embed.side_effect = _fake_embed
+
+    return {
+        "qdrant": fake_qdrant,
+        "fastembed": mock_embedder,
+    }
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_pending_stores():
+    """Give every test empty shared pending stores, so items added through
+    the process-wide stores can't leak between tests.
+    """
+    import pendomind.tools
+
+    pendomind.tools._shared_pending_stores.clear()
+    yield
+    pendomind.tools._shared_pending_stores.clear()
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine to completion from a plain (sync) test.
+
+    For tests that just await one call: they skip pytest-asyncio's per-test
+    machinery and share a single loop for the session. Keep async tests for
+    anything exercising concurrency.
+    """
+    with asyncio.Runner() as runner:
+        yield runner.run
+
+
+@pytest.fixture(scope="module")
+def config():
+    """Default configuration, shared within a test module."""
+    from pendomind.config import PendoMindConfig
+
+    return PendoMindConfig()
+
+
+@pytest.fixture
+def kb(config, mock_external_services):
+    """KnowledgeBase backed by the mocked external services."""
+    from pendomind.knowledge import KnowledgeBase
+
+    return KnowledgeBase(config)
+
+
+@pytest.fixture(scope="class")
+def class_kb(config, _mock_services_template):
+    """KnowledgeBase shared by every test in a class.
+
+    For read-only workflows: the session mocks are still reset per test by
+    mock_external_services, so classes seed their results per test.
+    """
+    from pendomind.knowledge import KnowledgeBase
+
+    return KnowledgeBase(config)
+
+
+@pytest.fixture
+def pending_store(config):
+    """Empty PendingStore using the shared config."""
+    from pendomind.tools import PendingStore
+
+    return PendingStore(config=config)
+
+
+@pytest.fixture
+def middleware(config, kb, pending_store):
+    """QualityMiddleware wired to the kb and pending_store fixtures."""
+    from pendomind.middleware import QualityMiddleware
+
+    middleware = QualityMiddleware(config)
+    middleware.kb = kb
+    middleware.pending_store = pending_store
+    return middleware
+
+
+@pytest.fixture
+def remember_and_confirm(kb, middleware, pending_store):
+    """Helper that runs remember() and, if the result is pending, confirms it.
+
+    Call as ``await remember_and_confirm(approved=..., content=..., ...)``;
+    remaining keyword arguments go to remember(). Returns
+    (remember_result, confirm_result), where confirm_result is None when the
+    content didn't go to pending.
+    """
+    from pendomind.tools import remember, remember_confirm
+
+    async def _remember_and_confirm(approved: bool = True, **kwargs):
+        result = await remember(middleware=middleware, **kwargs)
+        if result["status"] != "pending":
+            return result, None
+
+        confirm_result = await remember_confirm(
+            pending_id=result["pending_id"],
+            approved=approved,
+            pending_store=pending_store,
+            kb=kb,
+        )
+        return result, confirm_result
+
+    return _remember_and_confirm
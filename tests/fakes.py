@@ -0,0 +1,138 @@
+"""Lightweight fakes for Qdrant client objects and middleware collaborators."""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class FakePoint:
+    """Stand-in for a Qdrant ScoredPoint (query_points result)."""
+
+    id: str
+    score: float
+    payload: dict
+
+
+@dataclass(slots=True)
+class FakeRecord:
+    """Stand-in for a Qdrant Record (scroll/retrieve result, no score)."""
+
+    id: str
+    payload: dict
+    vector: list | None = None
+
+
+@dataclass(slots=True)
+class FakeResponse:
+    """Stand-in for a Qdrant QueryResponse."""
+
+    points: list
+
+
+class FakeQdrant:
+    """Minimal QdrantClient stand-in with canned responses.
+
+    Only implements the calls the store/search/context workflows make, and
+    records upserts in a plain list instead of mock call tracking.
+    """
+
+    __slots__ = (
+        "collection_exists_flag",
+        "query_response",
+        "scroll_response",
+        "upsert_calls",
+    )
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Return to an empty, existing collection with no recorded calls."""
+        self.collection_exists_flag = True
+        self.query_response = FakeResponse(points=[])
+        self.scroll_response = ([], None)
+        self.upsert_calls: list[tuple[tuple, dict]] = []
+
+    def collection_exists(self, *args, **kwargs) -> bool:
+        return self.collection_exists_flag
+
+    def create_collection(self, *args, **kwargs) -> None:
+        self.collection_exists_flag = True
+
+    def query_points(self, *args, **kwargs) -> FakeResponse:
+        return self.query_response
+
+    def scroll(self, *args, **kwargs) -> tuple[list, object]:
+        return self.scroll_response
+
+    def upsert(self, *args, **kwargs) -> None:
+        self.upsert_calls.append((args, kwargs))
+
+
+class FakeScorer:
+    """QualityScorer stand-in that returns a fixed analysis."""
+
+    __slots__ = ("analysis", "score_calls")
+
+    def __init__(self, analysis: Any) -> None:
+        self.analysis = analysis
+        self.score_calls = 0
+
+    async def score(
+        self, content: str, type_name: str, source: str, content_lower=None
+    ) -> Any:
+        self.score_calls += 1
+        return self.analysis
+
+
+class FakeKnowledgeBase:
+    """KnowledgeBase stand-in for the middleware's embed/dedupe/store calls.
+
+    Records stores as keyword dicts and counts duplicate lookups instead of
+    mock call tracking.
+    """
+
+    __slots__ = (
+        "embedding",
+        "duplicates",
+        "point_id",
+        "embedding_calls",
+        "find_duplicates_calls",
+        "store_calls",
+    )
+
+    def __init__(
+        self, embedding: Any, duplicates: list | None = None, point_id: str = "stored-123"
+    ) -> None:
+        self.embedding = embedding
+        self.duplicates = duplicates or []
+        self.point_id = point_id
+        self.embedding_calls = 0
+        self.find_duplicates_calls = 0
+        self.store_calls: list[dict] = []
+
+    async def get_embedding_batched(self, content: str) -> Any:
+        self.embedding_calls += 1
+        return self.embedding
+
+    async def find_duplicates(self, embedding: Any, threshold=None) -> list:
+        self.find_duplicates_calls += 1
+        return self.duplicates
+
+    async def store(self, **kwargs) -> str:
+        self.store_calls.append(kwargs)
+        return self.point_id
+
+
+class FakePendingStore:
+    """PendingStore stand-in that records added items."""
+
+    __slots__ = ("pending_id", "added")
+
+    def __init__(self, pending_id: str = "pending-456") -> None:
+        self.pending_id = pending_id
+        self.added: list = []
+
+    def add(self, item: Any) -> str:
+        self.added.append(item)
+        return self.pending_id
@@ -34,6 +34,21 @@ thresholds:
         # Should keep default for unspecified
         assert config.thresholds.duplicate_similarity == 0.90
 
+    def test_load_pending_max_items(self, tmp_path):
+        """pending.max_items should load from YAML, defaulting to 1000."""
+        from pendomind.config import PendoMindConfig
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("""
+pending:
+  max_items: 50
+""")
+        config = PendoMindConfig.load(config_file)
+
+        assert config.pending.max_items == 50
+        assert config.pending.ttl_minutes == 30
+        assert PendoMindConfig().pending.max_items == 1000
+
     def test_load_from_project_config(self, temp_config_file):
         """Load configuration from project config file."""
         from pendomind.config import PendoMindConfig
@@ -58,6 +73,18 @@ class TestThresholdsConfig:
         assert thresholds.auto_approve_score == 0.85
         assert thresholds.duplicate_similarity == 0.90
 
+    def test_thresholds_are_frozen(self):
+        """Sub-configs are immutable; use dataclasses.replace() to change them."""
+        from dataclasses import FrozenInstanceError, replace
+
+        from pendomind.config import ThresholdsConfig
+
+        thresholds = ThresholdsConfig()
+
+        with pytest.raises(FrozenInstanceError):
+            thresholds.min_quality_score = 0.5
+        assert replace(thresholds, min_quality_score=0.5).min_quality_score == 0.5
+
     def test_thresholds_from_dict(self):
         """Create thresholds from dictionary."""
         from pendomind.config import ThresholdsConfig
@@ -97,14 +124,65 @@ class TestTypesConfig:
 
     def test_get_min_score_for_type_with_override(self):
         """Type-specific override for min score."""
-        from pendomind.config import PendoMindConfig
+        from pendomind.config import PendoMindConfig, TypesConfig
 
-        config = PendoMindConfig()
-        config.types.overrides = {"incident": {"min_quality_score": 0.60}}
+        config = PendoMindConfig(
+            types=TypesConfig(overrides={"incident": {"min_quality_score": 0.60}})
+        )
 
         assert config.get_min_score_for_type("incident") == 0.60
         assert config.get_min_score_for_type("bug") == 0.65  # Still default
 
+    def test_get_min_score_for_type_from_yaml(self, tmp_path):
+        """Overrides loaded from YAML apply against the loaded default."""
+        from pendomind.config import PendoMindConfig
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("""
+thresholds:
+  min_quality_score: 0.70
+types:
+  overrides:
+    architecture:
+      min_quality_score: 0.75
+""")
+        config = PendoMindConfig.load(config_file)
+
+        assert config.get_min_score_for_type("architecture") == 0.75
+        assert config.get_min_score_for_type("bug") == 0.70
+        assert config.get_min_score_for_type("unknown") == 0.70
+
+    def test_get_min_score_for_type_after_replacing_sections(self):
+        """Assigning new thresholds or types sections refreshes the lookup."""
+        from dataclasses import replace
+
+        from pendomind.config import PendoMindConfig, TypesConfig
+
+        config = PendoMindConfig()
+        assert config.get_min_score_for_type("bug") == 0.65
+
+        config.thresholds = replace(config.thresholds, min_quality_score=0.9)
+        assert config.get_min_score_for_type("bug") == 0.9
+
+        config.types = TypesConfig(overrides={"bug": {"min_quality_score": 0.7}})
+        assert config.get_min_score_for_type("bug") == 0.7
+        assert config.get_min_score_for_type("feature") == 0.9
+
+    def test_type_overrides_are_read_only(self):
+        """In-place edits to overrides raise instead of leaving a stale lookup."""
+        from pendomind.config import PendoMindConfig, TypesConfig
+
+        config = PendoMindConfig(
+            types=TypesConfig(overrides={"bug": {"min_quality_score": 0.7}})
+        )
+
+        with pytest.raises(TypeError):
+            config.types.overrides["feature"] = {"min_quality_score": 0.8}
+        with pytest.raises(TypeError):
+            config.types.overrides["bug"]["min_quality_score"] = 0.8
+        assert config.types.overrides == {"bug": {"min_quality_score": 0.7}}
+        assert config.get_min_score_for_type("bug") == 0.7
+
 
 class TestFilteringConfig:
     """Test filtering configuration."""
@@ -1,166 +1,225 @@
 """Tests for PendoMind knowledge base module (Qdrant wrapper)."""
 
+import asyncio
+
+import numpy as np
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock
+
+import pendomind.knowledge
+from pendomind.config import PendoMindConfig, QdrantConfig
+from pendomind.knowledge import KnowledgeBase
+from tests.fakes import FakePoint, FakeRecord, FakeResponse
+
+# Default config shared by the whole module. Treat it as read-only: tests
+# that need different settings build a copy with dataclasses.replace().
+_BASE_CONFIG = PendoMindConfig()
+
+# Embedding stand-ins, built once; nothing under test mutates them
+_EMB_A = [0.1] * 1536
+_EMB_B = [0.2] * 1536
+_EMB_384 = [0.1] * 384
+_FAKE_EMB_384 = np.full(384, 0.1, dtype=np.float32)
+
+# Canned Qdrant responses; KnowledgeBase only reads them
+_EMPTY_QUERY = FakeResponse(points=[])
+_EMPTY_SCROLL = ([], None)
+_TWO_ENTRY_SCROLL = (
+    [
+        FakeRecord(
+            id="entry-1",
+            payload={"content": "Bug fix content", "type": "bug", "tags": ["test"]},
+        ),
+        FakeRecord(
+            id="entry-2",
+            payload={"content": "Feature content", "type": "feature", "tags": ["new"]},
+        ),
+    ],
+    None,  # No next page
+)
+
+
+@pytest.fixture(scope="module")
+def shared_kb():
+    """One KnowledgeBase for the whole module.
+
+    The client classes are already stubbed for the whole session (see
+    conftest), so construction never touches a real server. Config parsing,
+    the collection check and embedder construction happen once;
+    _reset_shared_kb gives each test a clean instance.
+    """
+    return KnowledgeBase(_BASE_CONFIG)
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_kb(shared_kb):
+    """Point shared_kb at fresh mocks and drop state left by the last test.
+
+    Restores the shared default config and clears the embedding cache and
+    batching worker, so tests don't see each other's state and can run in
+    any order or on any xdist worker.
+    """
+    mock_client = MagicMock()
+    mock_client.collection_exists.return_value = True
+    shared_kb._client = mock_client
+    shared_kb._embedder = MagicMock()
+    # FastEmbed's embed() returns a generator of numpy arrays
+    shared_kb._embedder.embed.return_value = iter([_FAKE_EMB_384])
+    shared_kb._embedding_cache.clear()
+    # The batching queue and worker may belong to another event loop
+    shared_kb._embed_queue = None
+    shared_kb._embed_worker = None
+    shared_kb.config = _BASE_CONFIG
+
+
+@pytest.fixture
+def mock_kb(shared_kb):
+    """(kb, mock_client) for the current test."""
+    return shared_kb, shared_kb._client
+
+
+@pytest.fixture
+def mock_embedder(mock_kb):
+    """The FastEmbed mock behind mock_kb."""
+    kb, _ = mock_kb
+    return kb._embedder
+
+
+@pytest.fixture
+def mock_client():
+    """Qdrant client mock returned by the session-stubbed QdrantClient."""
+    qdrant_class = pendomind.knowledge.QdrantClient
+    original = qdrant_class.return_value
+
+    client = MagicMock()
+    client.collection_exists.return_value = True
+    qdrant_class.return_value = client
+    yield client
+    qdrant_class.return_value = original
 
 
 class TestKnowledgeBaseInit:
     """Test knowledge base initialization."""
 
-    def test_creates_collection_if_not_exists(self):
+    def test_creates_collection_if_not_exists(self, mock_client):
         """Should create Qdrant collection on init if it doesn't exist."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = False
-            mock_qdrant.return_value = mock_client
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
+        mock_client.collection_exists.return_value = False
 
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
+        KnowledgeBase(_BASE_CONFIG)
 
-            mock_client.create_collection.assert_called_once()
+        mock_client.create_collection.assert_called_once()
 
-    def test_skips_collection_creation_if_exists(self):
+    def test_skips_collection_creation_if_exists(self, mock_client):
         """Should skip collection creation if it already exists."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
+        KnowledgeBase(_BASE_CONFIG)
 
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
+        mock_client.create_collection.assert_not_called()
 
-            mock_client.create_collection.assert_not_called()
-
-    def test_uses_config_collection_name(self):
+    def test_uses_config_collection_name(self, mock_client):
         """Should use collection name from config."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
-
-            config = PendoMindConfig()
-            config.qdrant.collection_name = "custom_collection"
-            kb = KnowledgeBase(config)
+        config = replace(
+            _BASE_CONFIG, qdrant=QdrantConfig(collection_name="custom_collection")
+        )
+        KnowledgeBase(config)
 
-            mock_client.collection_exists.assert_called_with("custom_collection")
+        mock_client.collection_exists.assert_called_with("custom_collection")
 
 
 class TestKnowledgeBaseStore:
     """Test storing knowledge entries."""
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked Qdrant client."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
-
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            yield kb, mock_client
-
-    @pytest.mark.asyncio
-    async def test_store_generates_deterministic_id(self, mock_kb):
+    def test_store_generates_deterministic_id(self, mock_kb, run):
         """Same content+source should generate same ID (for idempotent upserts)."""
         kb, mock_client = mock_kb
 
-        id1 = await kb.store(
-            content="Test bug fix content",
-            type="bug",
-            tags=["test"],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
+        id1 = run(
+            kb.store(
+                content="Test bug fix content",
+                type="bug",
+                tags=["test"],
+                source="github",
+                file_paths=None,
+                embedding=_EMB_A,
+            )
         )
 
-        id2 = await kb.store(
-            content="Test bug fix content",
-            type="bug",
-            tags=["test"],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
+        id2 = run(
+            kb.store(
+                content="Test bug fix content",
+                type="bug",
+                tags=["test"],
+                source="github",
+                file_paths=None,
+                embedding=_EMB_A,
+            )
         )
 
         assert id1 == id2
 
-    @pytest.mark.asyncio
-    async def test_store_different_content_different_id(self, mock_kb):
+    def test_store_different_content_different_id(self, mock_kb, run):
         """Different content should get different IDs."""
         kb, mock_client = mock_kb
 
-        id1 = await kb.store(
-            content="First content",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
+        id1 = run(
+            kb.store(
+                content="First content",
+                type="bug",
+                tags=[],
+                source="github",
+                file_paths=None,
+                embedding=_EMB_A,
+            )
         )
 
-        id2 = await kb.store(
-            content="Different content",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.2] * 1536,
+        id2 = run(
+            kb.store(
+                content="Different content",
+                type="bug",
+                tags=[],
+                source="github",
+                file_paths=None,
+                embedding=_EMB_B,
+            )
         )
 
         assert id1 != id2
 
-    @pytest.mark.asyncio
-    async def test_store_upserts_to_qdrant(self, mock_kb):
+    def test_store_upserts_to_qdrant(self, mock_kb, run):
         """Store should upsert point to Qdrant."""
         kb, mock_client = mock_kb
 
-        await kb.store(
-            content="Test content",
-            type="bug",
-            tags=["test"],
-            source="github",
-            file_paths=["src/api.py"],
-            embedding=[0.1] * 1536,
+        run(
+            kb.store(
+                content="Test content",
+                type="bug",
+                tags=["test"],
+                source="github",
+                file_paths=["src/api.py"],
+                embedding=_EMB_A,
+            )
         )
 
         mock_client.upsert.assert_called_once()
-        call_args = mock_client.upsert.call_args
-        assert call_args[1]["collection_name"] == "pendomind_knowledge"
+        kwargs = mock_client.upsert.call_args.kwargs
+        assert kwargs["collection_name"] == "pendomind_knowledge"
 
-    @pytest.mark.asyncio
-    async def test_store_includes_all_payload_fields(self, mock_kb):
+    def test_store_includes_all_payload_fields(self, mock_kb, run):
         """Stored payload should include all metadata fields."""
         kb, mock_client = mock_kb
 
-        await kb.store(
-            content="Test content for storage",
-            type="feature",
-            tags=["tag1", "tag2"],
-            source="confluence",
-            file_paths=["src/main.py", "src/utils.py"],
-            embedding=[0.1] * 1536,
+        run(
+            kb.store(
+                content="Test content for storage",
+                type="feature",
+                tags=["tag1", "tag2"],
+                source="confluence",
+                file_paths=["src/main.py", "src/utils.py"],
+                embedding=_EMB_A,
+            )
         )
 
-        call_args = mock_client.upsert.call_args
-        points = call_args[1]["points"]
+        points = mock_client.upsert.call_args.kwargs["points"]
         payload = points[0].payload
 
         assert payload["content"] == "Test content for storage"
@@ -170,53 +229,55 @@ class TestKnowledgeBaseStore:
         assert payload["file_paths"] == ["src/main.py", "src/utils.py"]
         assert "created_at" in payload
 
-    @pytest.mark.asyncio
-    async def test_store_returns_point_id(self, mock_kb):
+    def test_store_returns_point_id(self, mock_kb, run):
         """Store should return the generated point ID."""
         kb, mock_client = mock_kb
 
-        point_id = await kb.store(
-            content="Test content",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
+        point_id = run(
+            kb.store(
+                content="Test content",
+                type="bug",
+                tags=[],
+                source="github",
+                file_paths=None,
+                embedding=_EMB_A,
+            )
         )
 
         assert point_id is not None
         assert len(point_id) > 0
 
+    def test_store_accepts_embedding_bytes(self, mock_kb, mock_embedding, run):
+        """store() should accept raw float32 bytes as the embedding."""
+        kb, mock_client = mock_kb
 
-class TestKnowledgeBaseSearch:
-    """Test searching knowledge entries."""
+        run(
+            kb.store(
+                content="Test content",
+                type="bug",
+                tags=[],
+                source="github",
+                file_paths=None,
+                embedding=mock_embedding.tobytes(),
+            )
+        )
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked Qdrant client."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
+        vector = mock_client.upsert.call_args.kwargs["points"][0].vector
+        assert len(vector) == 384
+        assert vector[0] == pytest.approx(0.1)
 
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
 
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            yield kb, mock_client
+class TestKnowledgeBaseSearch:
+    """Test searching knowledge entries."""
 
-    @pytest.mark.asyncio
-    async def test_search_returns_results(self, mock_kb):
+    def test_search_returns_results(self, mock_kb, run):
         """Search should return formatted results from Qdrant."""
         kb, mock_client = mock_kb
 
         # qdrant-client 1.9+ uses query_points returning QueryResponse with .points
-        mock_client.query_points.return_value = MagicMock(
+        mock_client.query_points.return_value = FakeResponse(
             points=[
-                MagicMock(
+                FakePoint(
                     id="result-1",
                     score=0.95,
                     payload={
@@ -229,81 +290,60 @@ class TestKnowledgeBaseSearch:
             ]
         )
 
-        results = await kb.search([0.1] * 1536)
+        results = run(kb.search(_EMB_A))
 
         assert len(results) == 1
         assert results[0]["id"] == "result-1"
         assert results[0]["score"] == 0.95
         assert results[0]["content"] == "Bug fix content"
 
-    @pytest.mark.asyncio
-    async def test_search_with_type_filter(self, mock_kb):
+    def test_search_with_type_filter(self, mock_kb, run):
         """Search should apply type filter when provided."""
         kb, mock_client = mock_kb
-        mock_client.query_points.return_value = MagicMock(points=[])
+        mock_client.query_points.return_value = _EMPTY_QUERY
 
-        await kb.search([0.1] * 1536, type_filter="incident")
+        run(kb.search(_EMB_A, type_filter="incident"))
 
-        call_kwargs = mock_client.query_points.call_args[1]
-        assert call_kwargs["query_filter"] is not None
+        kwargs = mock_client.query_points.call_args.kwargs
+        assert kwargs["query_filter"] is not None
 
-    @pytest.mark.asyncio
-    async def test_search_respects_limit(self, mock_kb):
+    def test_search_respects_limit(self, mock_kb, run):
         """Search should respect the limit parameter."""
         kb, mock_client = mock_kb
-        mock_client.query_points.return_value = MagicMock(points=[])
+        mock_client.query_points.return_value = _EMPTY_QUERY
 
-        await kb.search([0.1] * 1536, limit=5)
+        run(kb.search(_EMB_A, limit=5))
 
-        call_kwargs = mock_client.query_points.call_args[1]
-        assert call_kwargs["limit"] == 5
+        kwargs = mock_client.query_points.call_args.kwargs
+        assert kwargs["limit"] == 5
 
-    @pytest.mark.asyncio
-    async def test_search_default_limit(self, mock_kb):
+    def test_search_default_limit(self, mock_kb, run):
         """Search should use default limit of 10."""
         kb, mock_client = mock_kb
-        mock_client.query_points.return_value = MagicMock(points=[])
+        mock_client.query_points.return_value = _EMPTY_QUERY
 
-        await kb.search([0.1] * 1536)
+        run(kb.search(_EMB_A))
 
-        call_kwargs = mock_client.query_points.call_args[1]
-        assert call_kwargs["limit"] == 10
+        kwargs = mock_client.query_points.call_args.kwargs
+        assert kwargs["limit"] == 10
 
 
 class TestKnowledgeBaseDuplicates:
     """Test duplicate detection."""
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked Qdrant client."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
-
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            yield kb, mock_client
-
-    @pytest.mark.asyncio
-    async def test_find_duplicates_returns_similar_items(self, mock_kb):
+    def test_find_duplicates_returns_similar_items(self, mock_kb, run):
         """find_duplicates should return items above similarity threshold."""
         kb, mock_client = mock_kb
 
         # qdrant-client 1.9+ uses query_points returning QueryResponse with .points
-        mock_client.query_points.return_value = MagicMock(
+        mock_client.query_points.return_value = FakeResponse(
             points=[
-                MagicMock(
+                FakePoint(
                     id="dup-1",
                     score=0.95,
                     payload={"content": "Very similar content", "type": "bug"},
                 ),
-                MagicMock(
+                FakePoint(
                     id="dup-2",
                     score=0.85,  # Below 0.90 threshold
                     payload={"content": "Somewhat similar", "type": "bug"},
@@ -311,21 +351,20 @@ class TestKnowledgeBaseDuplicates:
             ]
         )
 
-        duplicates = await kb.find_duplicates([0.1] * 1536, threshold=0.90)
+        duplicates = run(kb.find_duplicates(_EMB_A, threshold=0.90))
 
         # Should only return items above threshold
         assert len(duplicates) == 1
         assert duplicates[0]["id"] == "dup-1"
         assert duplicates[0]["similarity_score"] == 0.95
 
-    @pytest.mark.asyncio
-    async def test_find_duplicates_empty_when_none_similar(self, mock_kb):
+    def test_find_duplicates_empty_when_none_similar(self, mock_kb, run):
         """find_duplicates should return empty list when no similar items."""
         kb, mock_client = mock_kb
 
-        mock_client.query_points.return_value = MagicMock(
+        mock_client.query_points.return_value = FakeResponse(
             points=[
-                MagicMock(
+                FakePoint(
                     id="not-dup",
                     score=0.50,  # Well below threshold
                     payload={"content": "Different content", "type": "bug"},
@@ -333,19 +372,21 @@ class TestKnowledgeBaseDuplicates:
             ]
         )
 
-        duplicates = await kb.find_duplicates([0.1] * 1536, threshold=0.90)
+        duplicates = run(kb.find_duplicates(_EMB_A, threshold=0.90))
 
         assert len(duplicates) == 0
 
-    @pytest.mark.asyncio
-    async def test_find_duplicates_uses_config_threshold(self, mock_kb):
+    def test_find_duplicates_uses_config_threshold(self, mock_kb, run):
         """find_duplicates should use threshold from config if not specified."""
         kb, mock_client = mock_kb
-        kb.config.thresholds.duplicate_similarity = 0.85
+        kb.config = replace(
+            kb.config,
+            thresholds=replace(kb.config.thresholds, duplicate_similarity=0.85),
+        )
 
-        mock_client.query_points.return_value = MagicMock(
+        mock_client.query_points.return_value = FakeResponse(
             points=[
-                MagicMock(
+                FakePoint(
                     id="dup-1",
                     score=0.87,
                     payload={"content": "Similar content", "type": "bug"},
@@ -354,7 +395,7 @@ class TestKnowledgeBaseDuplicates:
         )
 
         # Don't specify threshold - should use config value
-        duplicates = await kb.find_duplicates([0.1] * 1536)
+        duplicates = run(kb.find_duplicates(_EMB_A))
 
         assert len(duplicates) == 1
 
@@ -362,31 +403,13 @@ class TestKnowledgeBaseDuplicates:
 class TestKnowledgeBaseFileContext:
     """Test file path based retrieval."""
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked Qdrant client."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
-
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            yield kb, mock_client
-
-    @pytest.mark.asyncio
-    async def test_get_by_file_path_returns_related(self, mock_kb):
+    def test_get_by_file_path_returns_related(self, mock_kb, run):
         """get_by_file_path should return knowledge related to a file."""
         kb, mock_client = mock_kb
 
         mock_client.scroll.return_value = (
             [
-                MagicMock(
+                FakeRecord(
                     id="entry-1",
                     payload={
                         "content": "Bug fix in api.py",
@@ -398,29 +421,27 @@ class TestKnowledgeBaseFileContext:
             None,  # No next page
         )
 
-        results = await kb.get_by_file_path("src/api.py")
+        results = run(kb.get_by_file_path("src/api.py"))
 
         assert len(results) == 1
         assert results[0]["content"] == "Bug fix in api.py"
 
-    @pytest.mark.asyncio
-    async def test_get_by_file_path_filters_correctly(self, mock_kb):
+    def test_get_by_file_path_filters_correctly(self, mock_kb, run):
         """get_by_file_path should apply correct filter to Qdrant."""
         kb, mock_client = mock_kb
-        mock_client.scroll.return_value = ([], None)
+        mock_client.scroll.return_value = _EMPTY_SCROLL
 
-        await kb.get_by_file_path("src/utils.py")
+        run(kb.get_by_file_path("src/utils.py"))
 
-        call_kwargs = mock_client.scroll.call_args[1]
-        assert call_kwargs["scroll_filter"] is not None
+        kwargs = mock_client.scroll.call_args.kwargs
+        assert kwargs["scroll_filter"] is not None
 
-    @pytest.mark.asyncio
-    async def test_get_by_file_path_empty_when_no_match(self, mock_kb):
+    def test_get_by_file_path_empty_when_no_match(self, mock_kb, run):
         """get_by_file_path should return empty list when no matches."""
         kb, mock_client = mock_kb
-        mock_client.scroll.return_value = ([], None)
+        mock_client.scroll.return_value = _EMPTY_SCROLL
 
-        results = await kb.get_by_file_path("nonexistent/file.py")
+        results = run(kb.get_by_file_path("nonexistent/file.py"))
 
         assert len(results) == 0
 
@@ -428,108 +449,180 @@ class TestKnowledgeBaseFileContext:
 class TestKnowledgeBaseEmbedding:
     """Test embedding generation using FastEmbed (runs locally)."""
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked dependencies."""
-        import numpy as np
+    @pytest.mark.asyncio
+    async def test_get_embedding_calls_fastembed(self, mock_kb, mock_embedder):
+        """get_embedding should call FastEmbed's embed method (runs locally)."""
+        kb, _ = mock_kb
+
+        # Reset mock to provide fresh generator
+        mock_embedder.embed.return_value = iter([_FAKE_EMB_384])
+
+        embedding = await kb.get_embedding("Test content for embedding")
 
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding") as mock_fastembed:
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
+        mock_embedder.embed.assert_called_once_with(["Test content for embedding"])
+        assert len(embedding) == 384  # bge-small-en-v1.5 produces 384 dimensions
 
-            # FastEmbed's embed() returns a generator of numpy arrays
-            mock_embedder = MagicMock()
-            mock_embedder.embed.return_value = iter([np.array([0.1] * 384)])
-            mock_fastembed.return_value = mock_embedder
+    @pytest.mark.asyncio
+    async def test_get_embedding_returns_float32_array(self, mock_kb, mock_embedder):
+        """get_embedding should return a read-only float32 array."""
+        kb, _ = mock_kb
+        vector = np.full(384, 0.5, dtype=np.float32)
+        mock_embedder.embed.return_value = iter([vector])
 
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
+        embedding = await kb.get_embedding("Test content")
 
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            kb._embedder = mock_embedder
-            yield kb, mock_embedder
+        assert isinstance(embedding, np.ndarray)
+        assert embedding.dtype == np.float32
+        assert embedding.shape == (384,)
+        assert not embedding.flags.writeable
+        assert vector.flags.writeable  # the model's array is not touched
 
     @pytest.mark.asyncio
-    async def test_get_embedding_calls_fastembed(self, mock_kb):
-        """get_embedding should call FastEmbed's embed method (runs locally)."""
-        import numpy as np
+    async def test_get_embedding_caches_repeated_content(self, mock_kb, mock_embedder):
+        """Embedding the same content twice should only run the model once."""
+        kb, _ = mock_kb
+        mock_embedder.embed.side_effect = lambda texts: iter([_FAKE_EMB_384])
 
-        kb, mock_embedder = mock_kb
+        first = await kb.get_embedding("Same content")
+        second = await kb.get_embedding("Same content")
+        await kb.get_embedding("Other content")
 
-        # Reset mock to provide fresh generator
-        mock_embedder.embed.return_value = iter([np.array([0.1] * 384)])
+        assert first is second
+        assert mock_embedder.embed.call_count == 2
 
-        embedding = await kb.get_embedding("Test content for embedding")
+    @pytest.mark.asyncio
+    async def test_get_embedding_cache_evicts_least_recent(
+        self, mock_kb, mock_embedder
+    ):
+        """Cache should hold at most embeddings.cache_size entries."""
+        kb, _ = mock_kb
+        kb.config = replace(
+            kb.config, embeddings=replace(kb.config.embeddings, cache_size=2)
+        )
+        mock_embedder.embed.side_effect = lambda texts: iter([_FAKE_EMB_384])
 
-        mock_embedder.embed.assert_called_once_with(["Test content for embedding"])
-        assert len(embedding) == 384  # bge-small-en-v1.5 produces 384 dimensions
+        await kb.get_embedding("first")
+        await kb.get_embedding("second")
+        await kb.get_embedding("first")  # refresh "first"
+        await kb.get_embedding("third")  # evicts "second"
+        await kb.get_embedding("first")
+
+        assert len(kb._embedding_cache) == 2
+        assert mock_embedder.embed.call_count == 3
+
+        await kb.get_embedding("second")
+        assert mock_embedder.embed.call_count == 4
 
     @pytest.mark.asyncio
-    async def test_get_embedding_returns_list(self, mock_kb):
-        """get_embedding should return a Python list (not numpy array)."""
-        import numpy as np
+    async def test_get_embedding_batched_coalesces_concurrent_calls(
+        self, mock_kb, mock_embedder
+    ):
+        """Concurrent batched requests should share a single model call."""
+        kb, _ = mock_kb
+        mock_embedder.embed.side_effect = lambda texts: iter(
+            [np.full(384, i, dtype=np.float32) for i in range(len(texts))]
+        )
 
-        kb, mock_embedder = mock_kb
-        mock_embedder.embed.return_value = iter([np.array([0.5] * 384)])
+        first, second, repeat = await asyncio.gather(
+            kb.get_embedding_batched("first"),
+            kb.get_embedding_batched("second"),
+            kb.get_embedding_batched("first"),
+        )
 
-        embedding = await kb.get_embedding("Test content")
+        mock_embedder.embed.assert_called_once_with(["first", "second"])
+        assert first is repeat
+        np.testing.assert_array_equal(first, np.zeros(384, dtype=np.float32))
+        np.testing.assert_array_equal(second, np.ones(384, dtype=np.float32))
 
-        assert isinstance(embedding, list)
-        assert all(isinstance(x, float) for x in embedding)
+        # Results are cached for both embedding paths
+        assert await kb.get_embedding("second") is second
+        mock_embedder.embed.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_embedding_batched_respects_batch_size(
+        self, mock_kb, mock_embedder
+    ):
+        """Batches should not exceed embeddings.batch_size texts."""
+        kb, _ = mock_kb
+        kb.config = replace(
+            kb.config, embeddings=replace(kb.config.embeddings, batch_size=2)
+        )
+        mock_embedder.embed.side_effect = lambda texts: iter(
+            [_FAKE_EMB_384 for _ in texts]
+        )
 
-class TestKnowledgeBaseGetAll:
-    """Test listing all knowledge entries."""
+        await asyncio.gather(
+            *(kb.get_embedding_batched(f"text {i}") for i in range(5))
+        )
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked Qdrant client."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
+        batch_sizes = [len(call.args[0]) for call in mock_embedder.embed.call_args_list]
+        assert batch_sizes == [2, 2, 1]
 
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
+    @pytest.mark.asyncio
+    async def test_get_embedding_batched_propagates_errors(
+        self, mock_kb, mock_embedder
+    ):
+        """Model errors should be raised to every caller in the batch."""
+        kb, _ = mock_kb
+        mock_embedder.embed.side_effect = RuntimeError("model failed")
 
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            yield kb, mock_client
+        with pytest.raises(RuntimeError, match="model failed"):
+            await kb.get_embedding_batched("Test content")
 
     @pytest.mark.asyncio
-    async def test_get_all_returns_all_entries(self, mock_kb):
+    async def test_get_embedding_batched_lone_request_skips_wait(
+        self, mock_kb, mock_embedder
+    ):
+        """A single uncached request shouldn't sit out batch_wait_ms."""
+        kb, _ = mock_kb
+        kb.config = replace(
+            kb.config, embeddings=replace(kb.config.embeddings, batch_wait_ms=10_000)
+        )
+        mock_embedder.embed.side_effect = lambda texts: iter(
+            [_FAKE_EMB_384 for _ in texts]
+        )
+
+        embedding = await asyncio.wait_for(
+            kb.get_embedding_batched("Test content"), timeout=1
+        )
+
+        np.testing.assert_array_equal(embedding, _FAKE_EMB_384)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("started", [False, True])
+    async def test_get_embedding_batched_fails_queued_requests_on_cancel(
+        self, mock_kb, started
+    ):
+        """Cancelling the worker fails its queued requests instead of hanging."""
+        kb, _ = mock_kb
+        kb.config = replace(
+            kb.config, embeddings=replace(kb.config.embeddings, batch_wait_ms=10_000)
+        )
+        requests = asyncio.gather(
+            kb.get_embedding_batched("first"),
+            kb.get_embedding_batched("second"),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(0)  # callers enqueue
+        if started:
+            await asyncio.sleep(0)  # worker enters its batch_wait sleep
+        kb._embed_worker.cancel()
+
+        results = await asyncio.wait_for(requests, timeout=1)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class TestKnowledgeBaseGetAll:
+    """Test listing all knowledge entries."""
+
+    def test_get_all_returns_all_entries(self, mock_kb, run):
         """get_all should return all entries from Qdrant."""
         kb, mock_client = mock_kb
 
-        mock_client.scroll.return_value = (
-            [
-                MagicMock(
-                    id="entry-1",
-                    payload={
-                        "content": "Bug fix content",
-                        "type": "bug",
-                        "tags": ["test"],
-                    },
-                ),
-                MagicMock(
-                    id="entry-2",
-                    payload={
-                        "content": "Feature content",
-                        "type": "feature",
-                        "tags": ["new"],
-                    },
-                ),
-            ],
-            None,  # No next page
-        )
+        mock_client.scroll.return_value = _TWO_ENTRY_SCROLL
 
-        results = await kb.get_all()
+        results = run(kb.get_all())
 
         assert len(results) == 2
         assert results[0]["id"] == "entry-1"
@@ -537,76 +630,54 @@ class TestKnowledgeBaseGetAll:
         assert results[1]["id"] == "entry-2"
         assert results[1]["type"] == "feature"
 
-    @pytest.mark.asyncio
-    async def test_get_all_with_type_filter(self, mock_kb):
+    def test_get_all_with_type_filter(self, mock_kb, run):
         """get_all should apply type filter when provided."""
         kb, mock_client = mock_kb
-        mock_client.scroll.return_value = ([], None)
+        mock_client.scroll.return_value = _EMPTY_SCROLL
 
-        await kb.get_all(type_filter="incident")
+        run(kb.get_all(type_filter="incident"))
 
-        call_kwargs = mock_client.scroll.call_args[1]
-        assert call_kwargs["scroll_filter"] is not None
+        kwargs = mock_client.scroll.call_args.kwargs
+        assert kwargs["scroll_filter"] is not None
 
-    @pytest.mark.asyncio
-    async def test_get_all_respects_limit(self, mock_kb):
+    def test_get_all_respects_limit(self, mock_kb, run):
         """get_all should respect the limit parameter."""
         kb, mock_client = mock_kb
-        mock_client.scroll.return_value = ([], None)
+        mock_client.scroll.return_value = _EMPTY_SCROLL
 
-        await kb.get_all(limit=50)
+        run(kb.get_all(limit=50))
 
-        call_kwargs = mock_client.scroll.call_args[1]
-        assert call_kwargs["limit"] == 50
+        kwargs = mock_client.scroll.call_args.kwargs
+        assert kwargs["limit"] == 50
 
-    @pytest.mark.asyncio
-    async def test_get_all_empty_collection(self, mock_kb):
+    def test_get_all_empty_collection(self, mock_kb, run):
         """get_all should return empty list for empty collection."""
         kb, mock_client = mock_kb
-        mock_client.scroll.return_value = ([], None)
+        mock_client.scroll.return_value = _EMPTY_SCROLL
 
-        results = await kb.get_all()
+        results = run(kb.get_all())
 
         assert results == []
 
-    @pytest.mark.asyncio
-    async def test_get_all_without_filter(self, mock_kb):
+    def test_get_all_without_filter(self, mock_kb, run):
         """get_all without filter should not apply scroll_filter."""
         kb, mock_client = mock_kb
-        mock_client.scroll.return_value = ([], None)
+        mock_client.scroll.return_value = _EMPTY_SCROLL
 
-        await kb.get_all()
+        run(kb.get_all())
 
-        call_kwargs = mock_client.scroll.call_args[1]
-        assert call_kwargs["scroll_filter"] is None
+        kwargs = mock_client.scroll.call_args.kwargs
+        assert kwargs["scroll_filter"] is None
 
 
 class TestKnowledgeBaseDelete:
     """Test deleting knowledge entries."""
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked Qdrant client."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
-
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            yield kb, mock_client
-
-    @pytest.mark.asyncio
-    async def test_delete_by_id(self, mock_kb):
+    def test_delete_by_id(self, mock_kb, run):
         """delete should remove entry by ID."""
         kb, mock_client = mock_kb
 
-        await kb.delete("entry-123")
+        run(kb.delete("entry-123"))
 
         mock_client.delete.assert_called_once()
 
@@ -614,32 +685,14 @@ class TestKnowledgeBaseDelete:
 class TestKnowledgeBaseGetById:
     """Test retrieving knowledge entries by ID."""
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked Qdrant client."""
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding"):
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
-
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            yield kb, mock_client
-
-    @pytest.mark.asyncio
-    async def test_get_by_id_returns_entry(self, mock_kb):
+    def test_get_by_id_returns_entry(self, mock_kb, run):
         """get_by_id should return entry with payload and vector."""
         kb, mock_client = mock_kb
 
         mock_client.retrieve.return_value = [
-            MagicMock(
+            FakeRecord(
                 id="entry-123",
-                vector=[0.1] * 384,
+                vector=_EMB_384,
                 payload={
                     "content": "Bug fix content",
                     "type": "bug",
@@ -650,7 +703,7 @@ class TestKnowledgeBaseGetById:
             )
         ]
 
-        result = await kb.get_by_id("entry-123")
+        result = run(kb.get_by_id("entry-123"))
 
         assert result is not None
         assert result["id"] == "entry-123"
@@ -658,68 +711,39 @@ class TestKnowledgeBaseGetById:
         assert result["type"] == "bug"
         assert "vector" in result
 
-    @pytest.mark.asyncio
-    async def test_get_by_id_not_found(self, mock_kb):
+    def test_get_by_id_not_found(self, mock_kb, run):
         """get_by_id should return None if entry not found."""
         kb, mock_client = mock_kb
         mock_client.retrieve.return_value = []
 
-        result = await kb.get_by_id("nonexistent-id")
+        result = run(kb.get_by_id("nonexistent-id"))
 
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_get_by_id_requests_vectors(self, mock_kb):
+    def test_get_by_id_requests_vectors(self, mock_kb, run):
         """get_by_id should request vectors for potential updates."""
         kb, mock_client = mock_kb
         mock_client.retrieve.return_value = []
 
-        await kb.get_by_id("entry-123")
+        run(kb.get_by_id("entry-123"))
 
         mock_client.retrieve.assert_called_once()
-        call_kwargs = mock_client.retrieve.call_args[1]
-        assert call_kwargs["with_vectors"] is True
+        kwargs = mock_client.retrieve.call_args.kwargs
+        assert kwargs["with_vectors"] is True
 
 
 class TestKnowledgeBaseUpdate:
     """Test updating knowledge entries."""
 
-    @pytest.fixture
-    def mock_kb(self):
-        """Create KB with mocked Qdrant client and embedder."""
-        import numpy as np
-
-        with patch("pendomind.knowledge.QdrantClient") as mock_qdrant, \
-             patch("pendomind.knowledge.TextEmbedding") as mock_fastembed:
-            mock_client = MagicMock()
-            mock_client.collection_exists.return_value = True
-            mock_qdrant.return_value = mock_client
-
-            mock_embedder = MagicMock()
-            mock_embedder.embed.return_value = iter([np.array([0.2] * 384)])
-            mock_fastembed.return_value = mock_embedder
-
-            from pendomind.knowledge import KnowledgeBase
-            from pendomind.config import PendoMindConfig
-
-            config = PendoMindConfig()
-            kb = KnowledgeBase(config)
-            kb._client = mock_client
-            kb._embedder = mock_embedder
-            yield kb, mock_client, mock_embedder
-
-    @pytest.mark.asyncio
-    async def test_update_content_reembeds(self, mock_kb):
+    def test_update_content_reembeds(self, mock_kb, mock_embedder, run):
         """Updating content should re-embed and upsert."""
-        import numpy as np
-
-        kb, mock_client, mock_embedder = mock_kb
+        kb, mock_client = mock_kb
 
         # Setup existing entry
         mock_client.retrieve.return_value = [
-            MagicMock(
+            FakeRecord(
                 id="entry-123",
-                vector=[0.1] * 384,
+                vector=_EMB_384,
                 payload={
                     "content": "Original content",
                     "type": "bug",
@@ -729,11 +753,13 @@ class TestKnowledgeBaseUpdate:
                 },
             )
         ]
-        mock_embedder.embed.return_value = iter([np.array([0.3] * 384)])
+        mock_embedder.embed.return_value = iter([np.full(384, 0.3, dtype=np.float32)])
 
-        result = await kb.update(
-            point_id="entry-123",
-            content="Updated content with more details",
+        result = run(
+            kb.update(
+                point_id="entry-123",
+                content="Updated content with more details",
+            )
         )
 
         # Should have called upsert (not set_payload) since content changed
@@ -741,15 +767,14 @@ class TestKnowledgeBaseUpdate:
         assert result["content"] == "Updated content with more details"
         assert "updated_at" in result
 
-    @pytest.mark.asyncio
-    async def test_update_metadata_only_uses_set_payload(self, mock_kb):
+    def test_update_metadata_only_uses_set_payload(self, mock_kb, run):
         """Updating only metadata should use set_payload (efficient)."""
-        kb, mock_client, mock_embedder = mock_kb
+        kb, mock_client = mock_kb
 
         mock_client.retrieve.return_value = [
-            MagicMock(
+            FakeRecord(
                 id="entry-123",
-                vector=[0.1] * 384,
+                vector=_EMB_384,
                 payload={
                     "content": "Original content",
                     "type": "bug",
@@ -760,9 +785,11 @@ class TestKnowledgeBaseUpdate:
             )
         ]
 
-        result = await kb.update(
-            point_id="entry-123",
-            tags=["updated", "tags"],
+        result = run(
+            kb.update(
+                point_id="entry-123",
+                tags=["updated", "tags"],
+            )
         )
 
         # Should have called set_payload (not upsert) since content didn't change
@@ -771,24 +798,22 @@ class TestKnowledgeBaseUpdate:
         assert result["tags"] == ["updated", "tags"]
         assert result["content"] == "Original content"
 
-    @pytest.mark.asyncio
-    async def test_update_not_found_raises(self, mock_kb):
+    def test_update_not_found_raises(self, mock_kb, run):
         """Updating non-existent entry should raise ValueError."""
-        kb, mock_client, mock_embedder = mock_kb
+        kb, mock_client = mock_kb
         mock_client.retrieve.return_value = []
 
         with pytest.raises(ValueError, match="Entry not found"):
-            await kb.update(point_id="nonexistent-id", content="New content")
+            run(kb.update(point_id="nonexistent-id", content="New content"))
 
-    @pytest.mark.asyncio
-    async def test_update_preserves_original_fields(self, mock_kb):
+    def test_update_preserves_original_fields(self, mock_kb, run):
         """Update should preserve fields not being updated."""
-        kb, mock_client, mock_embedder = mock_kb
+        kb, mock_client = mock_kb
 
         mock_client.retrieve.return_value = [
-            MagicMock(
+            FakeRecord(
                 id="entry-123",
-                vector=[0.1] * 384,
+                vector=_EMB_384,
                 payload={
                     "content": "Original content",
                     "type": "incident",
@@ -800,9 +825,11 @@ class TestKnowledgeBaseUpdate:
             )
         ]
 
-        result = await kb.update(
-            point_id="entry-123",
-            type="bug",  # Only update type
+        result = run(
+            kb.update(
+                point_id="entry-123",
+                type="bug",  # Only update type
+            )
         )
 
         assert result["type"] == "bug"
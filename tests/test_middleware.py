@@ -1,7 +1,26 @@
 """Tests for PendoMind quality control middleware."""
 
+from dataclasses import replace
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+
+from pendomind.quality import QualityAnalysis
+from tests.fakes import FakeKnowledgeBase, FakePendingStore, FakeScorer
+
+
+def _make_analysis(composite: float, **overrides) -> QualityAnalysis:
+    """Build a QualityAnalysis for a fake scorer, varying only what matters."""
+    fields = {
+        "relevance_score": 0.8,
+        "completeness_score": 0.7,
+        "credibility_score": 0.9,
+        "composite_score": composite,
+        "relevance_details": "Good",
+        "completeness_details": "Good",
+        "recommendations": [],
+    }
+    fields.update(overrides)
+    return QualityAnalysis(**fields)
 
 
 class TestQualityMiddlewareValidation:
@@ -78,6 +97,62 @@ class TestQualityMiddlewareValidation:
 
         assert result.is_valid is False
 
+    def test_validate_content_names_configured_pattern(self, middleware):
+        """Matching is case-insensitive but the error names the configured pattern."""
+        content = "Rotate the API_KEY after the PASSWORD change."
+        result = middleware.validate_content(content)
+
+        assert result.is_valid is False
+        assert result.error == "Content contains excluded pattern: 'api_key'"
+
+    def test_validate_content_no_patterns_configured(self):
+        """With no excluded patterns, any content passes."""
+        from pendomind.config import PendoMindConfig
+        from pendomind.middleware import QualityMiddleware
+
+        config = PendoMindConfig()
+        config.filtering = replace(config.filtering, excluded_patterns=[])
+        middleware = QualityMiddleware(config)
+
+        assert middleware.validate_content("The password is hunter2").is_valid is True
+
+    def test_validate_content_uses_automaton_when_available(self):
+        """With pyahocorasick installed, patterns are matched by an automaton."""
+        pytest.importorskip("ahocorasick")
+        from pendomind.middleware import QualityMiddleware
+
+        middleware = QualityMiddleware()
+
+        assert middleware._excluded_automaton is not None
+        result = middleware.validate_content("Rotate the API_KEY every quarter.")
+        assert result.error == "Content contains excluded pattern: 'api_key'"
+
+    def test_validate_content_regex_fallback(self, monkeypatch):
+        """Without pyahocorasick, the compiled regex gives the same results."""
+        import pendomind.middleware
+
+        monkeypatch.setattr(pendomind.middleware, "ahocorasick", None)
+        middleware = pendomind.middleware.QualityMiddleware()
+
+        assert middleware._excluded_automaton is None
+        result = middleware.validate_content("Rotate the API_KEY every quarter.")
+        assert result.error == "Content contains excluded pattern: 'api_key'"
+        assert middleware.validate_content("Increase the pool size.").is_valid
+
+    @pytest.mark.parametrize(
+        "content", ["the ſecret sauce is here", "rotate the apİ_key yearly"]
+    )
+    def test_validate_content_regex_fallback_unicode_case_folds(
+        self, monkeypatch, content
+    ):
+        """Case folds that str.lower() leaves unmatched pass, as with `in`."""
+        import pendomind.middleware
+
+        monkeypatch.setattr(pendomind.middleware, "ahocorasick", None)
+        middleware = pendomind.middleware.QualityMiddleware()
+
+        assert middleware.validate_content(content).is_valid is True
+
     def test_validate_length_too_short(self, middleware):
         """Content below minimum length should fail."""
         content = "Fixed bug"  # Too short
@@ -101,6 +176,12 @@ class TestQualityMiddlewareValidation:
         assert result.is_valid is False
         assert "too long" in result.error.lower()
 
+    def test_validate_length_at_limits(self, middleware):
+        """Exactly min and max word counts are allowed; one more is too long."""
+        assert middleware.validate_length("word " * 15).is_valid is True
+        assert middleware.validate_length("word " * 5000).is_valid is True
+        assert middleware.validate_length(" word" * 5001).is_valid is False
+
 
 class TestQualityMiddlewareProcessing:
     """Test the full middleware processing flow."""
@@ -114,39 +195,19 @@ class TestQualityMiddlewareProcessing:
         return QualityMiddleware(config)
 
     @pytest.fixture
-    def mock_scorer(self):
-        """Mock quality scorer."""
-        from pendomind.quality import QualityAnalysis
-
-        mock = MagicMock()
-        mock.score = AsyncMock(
-            return_value=QualityAnalysis(
-                relevance_score=0.8,
-                completeness_score=0.7,
-                credibility_score=0.9,
-                composite_score=0.80,
-                relevance_details="Good",
-                completeness_details="Good",
-                recommendations=[],
-            )
-        )
-        return mock
+    def fake_scorer(self):
+        """Fake quality scorer."""
+        return FakeScorer(_make_analysis(0.80))
 
     @pytest.fixture
-    def mock_kb(self):
-        """Mock knowledge base."""
-        mock = MagicMock()
-        mock.get_embedding = AsyncMock(return_value=[0.1] * 1536)
-        mock.find_duplicates = AsyncMock(return_value=[])
-        mock.store = AsyncMock(return_value="stored-123")
-        return mock
+    def fake_kb(self, mock_embedding):
+        """Fake knowledge base."""
+        return FakeKnowledgeBase(mock_embedding)
 
     @pytest.fixture
-    def mock_pending_store(self):
-        """Mock pending store."""
-        mock = MagicMock()
-        mock.add = MagicMock(return_value="pending-456")
-        return mock
+    def fake_pending_store(self):
+        """Fake pending store."""
+        return FakePendingStore()
 
     @pytest.mark.asyncio
     async def test_process_rejects_invalid_type(self, middleware):
@@ -166,7 +227,10 @@ class TestQualityMiddlewareProcessing:
     async def test_process_rejects_excluded_pattern(self, middleware):
         """Content with excluded pattern should be rejected."""
         result = await middleware.process(
-            content="Set the password to secret123 in the config file for production access.",
+            content=(
+                "Set the password to secret123 in the config file for production "
+                "access so the nightly deploy job can log in."
+            ),
             type="bug",
             tags=[],
             source="github",
@@ -192,25 +256,19 @@ class TestQualityMiddlewareProcessing:
 
     @pytest.mark.asyncio
     async def test_process_auto_rejects_low_quality(
-        self, middleware, mock_scorer, mock_kb
+        self, middleware, fake_scorer, fake_kb
     ):
         """Low quality content should be auto-rejected."""
-        from pendomind.quality import QualityAnalysis
-
-        mock_scorer.score = AsyncMock(
-            return_value=QualityAnalysis(
-                relevance_score=0.3,
-                completeness_score=0.2,
-                credibility_score=0.5,
-                composite_score=0.30,  # Below 0.65 threshold
-                relevance_details="Low",
-                completeness_details="Low",
-                recommendations=["Add more detail"],
-            )
+        fake_scorer.analysis = _make_analysis(
+            0.30,  # Below 0.65 threshold
+            relevance_score=0.3,
+            completeness_score=0.2,
+            credibility_score=0.5,
+            recommendations=["Add more detail"],
         )
 
-        middleware.scorer = mock_scorer
-        middleware.kb = mock_kb
+        middleware.scorer = fake_scorer
+        middleware.kb = fake_kb
 
         result = await middleware.process(
             content="This content is valid length but low quality and lacks technical depth. It does not contain enough information to be useful for future reference or debugging purposes.",
@@ -222,28 +280,23 @@ class TestQualityMiddlewareProcessing:
 
         assert result["status"] == "rejected"
         assert result["quality_score"] < 0.65
+        assert fake_kb.embedding_calls == 0
+        assert fake_kb.find_duplicates_calls == 0
 
     @pytest.mark.asyncio
     async def test_process_auto_approves_high_quality(
-        self, middleware, mock_scorer, mock_kb
+        self, middleware, fake_scorer, fake_kb
     ):
         """High quality content should be auto-stored."""
-        from pendomind.quality import QualityAnalysis
-
-        mock_scorer.score = AsyncMock(
-            return_value=QualityAnalysis(
-                relevance_score=0.9,
-                completeness_score=0.9,
-                credibility_score=0.95,
-                composite_score=0.91,  # Above 0.85 threshold
-                relevance_details="Excellent",
-                completeness_details="Complete",
-                recommendations=[],
-            )
+        fake_scorer.analysis = _make_analysis(
+            0.91,  # Above 0.85 threshold
+            relevance_score=0.9,
+            completeness_score=0.9,
+            credibility_score=0.95,
         )
 
-        middleware.scorer = mock_scorer
-        middleware.kb = mock_kb
+        middleware.scorer = fake_scorer
+        middleware.kb = fake_kb
 
         result = await middleware.process(
             content="""
@@ -263,30 +316,23 @@ class TestQualityMiddlewareProcessing:
         )
 
         assert result["status"] == "stored"
-        mock_kb.store.assert_called_once()
+        assert len(fake_kb.store_calls) == 1
 
     @pytest.mark.asyncio
     async def test_process_returns_pending_for_medium_quality(
-        self, middleware, mock_scorer, mock_kb, mock_pending_store
+        self, middleware, fake_scorer, fake_kb, fake_pending_store
     ):
         """Medium quality content should go to pending."""
-        from pendomind.quality import QualityAnalysis
-
-        mock_scorer.score = AsyncMock(
-            return_value=QualityAnalysis(
-                relevance_score=0.7,
-                completeness_score=0.7,
-                credibility_score=0.8,
-                composite_score=0.72,  # Between 0.65 and 0.85
-                relevance_details="Good",
-                completeness_details="Adequate",
-                recommendations=["Add more context"],
-            )
+        fake_scorer.analysis = _make_analysis(
+            0.72,  # Between 0.65 and 0.85
+            relevance_score=0.7,
+            credibility_score=0.8,
+            recommendations=["Add more context"],
         )
 
-        middleware.scorer = mock_scorer
-        middleware.kb = mock_kb
-        middleware.pending_store = mock_pending_store
+        middleware.scorer = fake_scorer
+        middleware.kb = fake_kb
+        middleware.pending_store = fake_pending_store
 
         result = await middleware.process(
             content="Fixed the authentication issue by checking session validity before API calls. The issue was caused by stale sessions not being detected properly, leading to failed API requests in production.",
@@ -298,7 +344,62 @@ class TestQualityMiddlewareProcessing:
 
         assert result["status"] == "pending"
         assert result["pending_id"] is not None
-        mock_pending_store.add.assert_called_once()
+        assert len(fake_pending_store.added) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "composite, status",
+        [(0.64, "rejected"), (0.65, "pending"), (0.84, "pending"), (0.85, "stored")],
+    )
+    async def test_process_routes_at_threshold_boundaries(
+        self, middleware, fake_scorer, fake_kb, fake_pending_store, composite, status
+    ):
+        """Minimum score routes to pending; auto-approve score stores."""
+        fake_scorer.analysis = _make_analysis(composite)
+        middleware.scorer = fake_scorer
+        middleware.kb = fake_kb
+        middleware.pending_store = fake_pending_store
+
+        result = await middleware.process(
+            content="Fixed the authentication issue by checking session validity before API calls. The issue was caused by stale sessions not being detected properly.",
+            type="bug",
+            tags=[],
+            source="github",
+            file_paths=None,
+        )
+
+        assert result["status"] == status
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "composite, status", [(0.87, "rejected"), (0.89, "rejected"), (0.90, "stored")]
+    )
+    async def test_process_type_minimum_above_auto_approve(
+        self, fake_scorer, fake_kb, fake_pending_store, composite, status
+    ):
+        """A type minimum above auto-approve rejects everything below it."""
+        from pendomind.config import PendoMindConfig, TypesConfig
+        from pendomind.middleware import QualityMiddleware
+
+        middleware = QualityMiddleware(
+            PendoMindConfig(
+                types=TypesConfig(overrides={"bug": {"min_quality_score": 0.90}})
+            )
+        )
+        fake_scorer.analysis = _make_analysis(composite)
+        middleware.scorer = fake_scorer
+        middleware.kb = fake_kb
+        middleware.pending_store = fake_pending_store
+
+        result = await middleware.process(
+            content="Fixed the authentication issue by checking session validity before API calls. The issue was caused by stale sessions not being detected properly.",
+            type="bug",
+            tags=[],
+            source="github",
+            file_paths=None,
+        )
+
+        assert result["status"] == status
 
 
 class TestQualityMiddlewareDuplicateDetection:
@@ -313,48 +414,36 @@ class TestQualityMiddlewareDuplicateDetection:
         return QualityMiddleware(config)
 
     @pytest.fixture
-    def mock_scorer(self):
-        from pendomind.quality import QualityAnalysis
-
-        mock = MagicMock()
-        mock.score = AsyncMock(
-            return_value=QualityAnalysis(
-                relevance_score=0.9,
-                completeness_score=0.9,
-                credibility_score=0.95,
-                composite_score=0.91,
-                relevance_details="Good",
-                completeness_details="Good",
-                recommendations=[],
+    def fake_scorer(self):
+        return FakeScorer(
+            _make_analysis(
+                0.91, relevance_score=0.9, completeness_score=0.9, credibility_score=0.95
             )
         )
-        return mock
 
     @pytest.fixture
-    def mock_kb_with_duplicates(self):
-        """Mock KB that returns duplicates."""
-        mock = MagicMock()
-        mock.get_embedding = AsyncMock(return_value=[0.1] * 1536)
-        mock.find_duplicates = AsyncMock(
-            return_value=[
+    def fake_kb_with_duplicates(self, mock_embedding):
+        """Fake KB that returns duplicates."""
+        return FakeKnowledgeBase(
+            mock_embedding,
+            duplicates=[
                 {
                     "id": "existing-123",
                     "similarity_score": 0.95,
                     "content_preview": "Very similar bug fix...",
                     "type": "bug",
                 }
-            ]
+            ],
+            point_id="stored-456",
         )
-        mock.store = AsyncMock(return_value="stored-456")
-        return mock
 
     @pytest.mark.asyncio
     async def test_process_detects_duplicates(
-        self, middleware, mock_scorer, mock_kb_with_duplicates
+        self, middleware, fake_scorer, fake_kb_with_duplicates
     ):
         """Should detect and report potential duplicates."""
-        middleware.scorer = mock_scorer
-        middleware.kb = mock_kb_with_duplicates
+        middleware.scorer = fake_scorer
+        middleware.kb = fake_kb_with_duplicates
 
         result = await middleware.process(
             content="Fixed the same bug that was fixed before with a similar approach. The database connection pool was exhausted under high load causing timeout errors for users.",
@@ -391,3 +480,15 @@ class TestValidationResult:
 
         assert result.is_valid is False
         assert result.error == "Something went wrong"
+
+    def test_validation_result_is_immutable(self):
+        """ValidationResult is frozen and slotted, so instances can be shared."""
+        from dataclasses import FrozenInstanceError
+
+        from pendomind.middleware import ValidationResult
+
+        result = ValidationResult(is_valid=True)
+
+        with pytest.raises(FrozenInstanceError):
+            result.is_valid = False
+        assert not hasattr(result, "__dict__")
@@ -159,6 +159,24 @@ class TestCompletenessScoring:
         # Should get length points but lack structure
         assert 0.15 <= score <= 0.4, f"Moderate length content should score moderately, got {score}"
 
+    @pytest.mark.asyncio
+    async def test_marker_automaton_matches_substring_fallback(
+        self, scorer, sample_bug_content, monkeypatch
+    ):
+        """The one-pass automaton scan agrees with per-marker substring checks."""
+        pytest.importorskip("ahocorasick")
+        import pendomind.quality
+
+        monkeypatch.setattr(pendomind.quality, "ahocorasick", None)
+        fallback = pendomind.quality.QualityScorer()
+
+        assert scorer._marker_automaton is not None
+        assert fallback._marker_automaton is None
+        for content in (sample_bug_content, "Because of the fix, run step 1. then 2."):
+            assert await scorer.calculate_completeness(
+                content, "bug"
+            ) == await fallback.calculate_completeness(content, "bug")
+
 
 class TestCredibilityScoring:
     """Test credibility score calculation (25% of composite)."""
@@ -294,6 +312,114 @@ class TestCompositeScoring:
         assert 0 <= analysis.credibility_score <= 1
         assert 0 <= analysis.composite_score <= 1
 
+    @pytest.mark.asyncio
+    async def test_score_batch_matches_score(
+        self, scorer, sample_bug_content, sample_low_quality_content
+    ):
+        """score_batch() should give the same analyses as scoring one by one."""
+        contents = [sample_bug_content, sample_low_quality_content]
+        types = ["bug", "feature"]
+        sources = ["github", "slack"]
+
+        batch = await scorer.score_batch(contents, types, sources)
+
+        assert batch == [
+            await scorer.score(c, t, s) for c, t, s in zip(contents, types, sources)
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "factors", [(0.35, 0.80, 0.90), (0.05, 0.40, 0.50), (0.05, 0.90, 0.20)]
+    )
+    async def test_composite_matches_scalar_formula(
+        self, scorer, monkeypatch, factors
+    ):
+        """The batched combine rounds like rel*w + comp*w + cred*w summed in order."""
+        relevance, completeness, credibility = factors
+        monkeypatch.setattr(scorer, "_relevance", lambda *_: (relevance, ""))
+        monkeypatch.setattr(scorer, "_completeness", lambda *_: (completeness, ""))
+
+        async def credibility_for(source):
+            return credibility, ""
+
+        monkeypatch.setattr(scorer, "calculate_credibility", credibility_for)
+        weights = scorer.WEIGHTS
+
+        analysis = await scorer.score("Some content", "bug", "github")
+
+        assert analysis.composite_score == round(
+            relevance * weights["relevance"]
+            + completeness * weights["completeness"]
+            + credibility * weights["credibility"],
+            2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_score_batch_rejects_mismatched_lengths(self, scorer):
+        """score_batch() needs one type and source per content."""
+        with pytest.raises(ValueError, match="same length"):
+            await scorer.score_batch(["a", "b"], ["bug"], ["github", "slack"])
+
+    @pytest.mark.asyncio
+    async def test_score_accepts_prelowered_content(self, sample_bug_content):
+        """Passing content_lower should give the same analysis."""
+        from pendomind.quality import QualityScorer
+
+        expected = await QualityScorer().score(sample_bug_content, "bug", "github")
+        analysis = await QualityScorer().score(
+            sample_bug_content,
+            "bug",
+            "github",
+            content_lower=sample_bug_content.lower(),
+        )
+
+        assert analysis == expected
+
+    @pytest.mark.asyncio
+    async def test_repeated_score_served_from_cache(self, scorer, sample_bug_content):
+        """Scoring the same (content, type, source) again should hit the cache."""
+        from unittest.mock import patch
+
+        first = await scorer.score(sample_bug_content, "bug", "github")
+        with patch.object(scorer, "_score_uncached") as uncached:
+            second = await scorer.score(sample_bug_content, "bug", "github")
+
+        uncached.assert_not_called()
+        assert second == first
+        # Each caller gets its own recommendations list
+        assert second.recommendations is not first.recommendations
+
+    @pytest.mark.asyncio
+    async def test_score_cache_keyed_on_type_and_source(self, scorer):
+        """Different type or source for the same content is scored separately."""
+        content = "Fixed the login error by retrying the token refresh"
+
+        await scorer.score(content, "bug", "github")
+        await scorer.score(content, "bug", "slack")
+        await scorer.score(content, "feature", "github")
+
+        assert len(scorer._score_cache) == 3
+
+    @pytest.mark.asyncio
+    async def test_score_cache_evicts_least_recent(self):
+        """Cache should hold at most scoring.cache_size entries."""
+        from dataclasses import replace
+
+        from pendomind.config import PendoMindConfig
+        from pendomind.quality import QualityScorer
+
+        config = PendoMindConfig()
+        config.scoring = replace(config.scoring, cache_size=2)
+        scorer = QualityScorer(config)
+
+        for content in ["first entry", "second entry", "third entry"]:
+            await scorer.score(content, "bug", "github")
+
+        assert len(scorer._score_cache) == 2
+        assert scorer._cached_score(
+            (scorer._content_key("first entry"), "bug", "github")
+        ) is None
+
 
 class TestQualityAnalysisModel:
     """Test QualityAnalysis data model."""
@@ -315,3 +441,22 @@ class TestQualityAnalysisModel:
         assert analysis.relevance_score == 0.8
         assert analysis.composite_score == 0.78
         assert len(analysis.recommendations) == 1
+
+    def test_quality_analysis_is_immutable(self):
+        """QualityAnalysis is frozen and slotted."""
+        from dataclasses import FrozenInstanceError
+
+        from pendomind.quality import QualityAnalysis
+
+        analysis = QualityAnalysis(
+            relevance_score=0.8,
+            completeness_score=0.7,
+            credibility_score=0.9,
+            composite_score=0.78,
+            relevance_details="Good technical content",
+            completeness_details="Has problem and solution",
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            analysis.composite_score = 0.9
+        assert not hasattr(analysis, "__dict__")
@@ -1,22 +1,67 @@
 """Tests for PendoMind tools module - PendingStore and MCP tools."""
 
-import pytest
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
+import pytest
+
+from pendomind.config import PendingConfig, PendoMindConfig
+from pendomind.tools import (
+    DEFAULT_TTL_MINUTES,
+    PendingItem,
+    PendingStore,
+    delete,
+    get_context,
+    list_all,
+    list_similar,
+    recall,
+    remember,
+    remember_confirm,
+    search,
+    shared_pending_store,
+    update,
+    upsert,
+)
+from tests.fakes import FakeKnowledgeBase, FakeScorer
+
 
 def _utc_now() -> datetime:
     """Get current UTC time (timezone-aware)."""
     return datetime.now(UTC)
 
 
+def _make_item(
+    item_id: str,
+    embedding: np.ndarray,
+    created_at: datetime | None = None,
+    **fields,
+) -> PendingItem:
+    """Build a PendingItem, varying only the fields a test cares about."""
+    values = {
+        "content": "Test content",
+        "type": "bug",
+        "tags": [],
+        "source": "github",
+        "file_paths": None,
+        "quality_analysis": MagicMock(),
+    }
+    values.update(fields)
+    if created_at is not None:
+        values["created_at"] = created_at
+    return PendingItem(id=item_id, embedding=embedding, **values)
+
+
 class TestPendingItem:
     """Test PendingItem data model."""
 
-    def test_pending_item_creation(self):
+    def test_pending_item_creation(self, mock_embedding):
         """PendingItem can be created with all required fields."""
-        from pendomind.tools import PendingItem
-
         item = PendingItem(
             id="test-123",
             content="Test bug fix content",
@@ -24,7 +69,7 @@ class TestPendingItem:
             tags=["test", "example"],
             source="github",
             file_paths=["src/api.py"],
-            embedding=[0.1] * 1536,
+            embedding=mock_embedding,
             quality_analysis=MagicMock(),
         )
 
@@ -34,13 +79,10 @@ class TestPendingItem:
         assert item.tags == ["test", "example"]
         assert item.source == "github"
         assert item.file_paths == ["src/api.py"]
-        assert len(item.embedding) == 1536
+        assert item.embedding is mock_embedding
 
-    def test_pending_item_has_created_at(self):
-        """PendingItem should have auto-generated created_at timestamp."""
-        from pendomind.tools import PendingItem
-
-        before = _utc_now()
+    def test_pending_item_embedding_is_float32_array(self, mock_embedding):
+        """PendingItem should hold the embedding as a float32 ndarray."""
         item = PendingItem(
             id="test-123",
             content="Test content",
@@ -48,34 +90,30 @@ class TestPendingItem:
             tags=[],
             source="github",
             file_paths=None,
-            embedding=[0.1] * 1536,
+            embedding=[0.1] * 384,
             quality_analysis=MagicMock(),
         )
-        after = _utc_now()
-
-        assert before <= item.created_at <= after
 
-    def test_pending_item_is_expired_fresh(self):
-        """Fresh item should not be expired."""
-        from pendomind.tools import PendingItem
+        assert isinstance(item.embedding, np.ndarray)
+        assert item.embedding.dtype == np.float32
 
+        # An existing float32 array is kept as-is (no copy)
         item = PendingItem(
-            id="test-123",
+            id="test-456",
             content="Test content",
             type="bug",
             tags=[],
             source="github",
             file_paths=None,
-            embedding=[0.1] * 1536,
+            embedding=mock_embedding,
             quality_analysis=MagicMock(),
         )
 
-        assert item.is_expired(ttl_minutes=30) is False
-
-    def test_pending_item_is_expired_old(self):
-        """Old item should be expired."""
-        from pendomind.tools import PendingItem
+        assert item.embedding is mock_embedding
 
+    def test_pending_item_accepts_embedding_bytes(self, mock_embedding):
+        """Raw float32 bytes should be wrapped as an array without copying."""
+        buffer = bytearray(mock_embedding.tobytes())
         item = PendingItem(
             id="test-123",
             content="Test content",
@@ -83,55 +121,114 @@ class TestPendingItem:
             tags=[],
             source="github",
             file_paths=None,
-            embedding=[0.1] * 1536,
+            embedding=buffer,
             quality_analysis=MagicMock(),
+        )
+
+        assert item.embedding.dtype == np.float32
+        assert np.array_equal(item.embedding, mock_embedding)
+        assert np.shares_memory(item.embedding, np.frombuffer(buffer, dtype=np.uint8))
+
+    def test_pending_item_equality_ignores_embedding_array(self, mock_embedding):
+        """Items with separate embedding arrays compare without raising."""
+        created = _utc_now()
+        analysis = MagicMock()
+        first = _make_item(
+            "test-123",
+            mock_embedding.copy(),
+            created_at=created,
+            quality_analysis=analysis,
+        )
+        second = _make_item(
+            "test-123",
+            mock_embedding.copy(),
+            created_at=created,
+            quality_analysis=analysis,
+        )
+
+        assert first == second
+        assert first != _make_item(
+            "test-456",
+            mock_embedding.copy(),
+            created_at=created,
+            quality_analysis=analysis,
+        )
+
+    def test_pending_item_has_created_at(self, mock_embedding):
+        """PendingItem should have auto-generated created_at timestamp."""
+        before = _utc_now()
+        item = _make_item("test-123", mock_embedding)
+        after = _utc_now()
+
+        assert before <= item.created_at <= after
+
+    def test_pending_item_is_expired_fresh(self, mock_embedding):
+        """Fresh item should not be expired."""
+        item = _make_item("test-123", mock_embedding)
+
+        assert item.is_expired(ttl_minutes=30) is False
+
+    def test_pending_item_is_expired_old(self, mock_embedding):
+        """Old item should be expired."""
+        item = _make_item(
+            "test-123",
+            mock_embedding,
             created_at=_utc_now() - timedelta(minutes=60),
         )
 
         assert item.is_expired(ttl_minutes=30) is True
 
-    def test_pending_item_optional_duplicate_info(self):
-        """PendingItem can have optional duplicate_info."""
-        from pendomind.tools import PendingItem
+    def test_pending_item_naive_created_at_treated_as_utc(self, mock_embedding):
+        """A naive created_at should be normalized to aware UTC."""
+        naive = datetime.now(UTC).replace(tzinfo=None) - timedelta(minutes=60)
+        item = _make_item("test-123", mock_embedding, created_at=naive)
 
-        item = PendingItem(
-            id="test-123",
-            content="Test content",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
-            quality_analysis=MagicMock(),
+        assert item.created_at.tzinfo is UTC
+        assert item.is_expired(ttl_minutes=30) is True
+
+    def test_pending_item_expires_at_from_created_at(self, mock_embedding):
+        """expires_at is precomputed; is_expired() without a TTL compares to it."""
+        created = _utc_now() - timedelta(minutes=10)
+        item = _make_item("test-123", mock_embedding, created_at=created)
+
+        assert item.expires_at == item._created_monotonic + DEFAULT_TTL_MINUTES * 60
+        assert item.is_expired() is False
+        assert item.is_expired(ttl_minutes=5) is True
+
+    def test_pending_item_optional_duplicate_info(self, mock_embedding):
+        """PendingItem can have optional duplicate_info."""
+        item = _make_item(
+            "test-123",
+            mock_embedding,
             duplicate_info={"similar_id": "existing-456", "similarity": 0.92},
         )
 
         assert item.duplicate_info is not None
         assert item.duplicate_info["similarity"] == 0.92
 
+    def test_pending_item_has_no_instance_dict(self, mock_embedding):
+        """PendingItem is slotted: no per-instance __dict__."""
+        item = _make_item("test-123", mock_embedding)
+
+        assert not hasattr(item, "__dict__")
+        with pytest.raises(AttributeError):
+            item.unexpected = True
+
 
 class TestPendingStore:
     """Test pending item storage with TTL."""
 
     @pytest.fixture
     def store(self):
-        from pendomind.tools import PendingStore
-
         return PendingStore(ttl_minutes=30)
 
     @pytest.fixture
-    def sample_item(self):
-        from pendomind.tools import PendingItem
-
-        return PendingItem(
-            id="test-123",
+    def sample_item(self, mock_embedding):
+        return _make_item(
+            "test-123",
+            mock_embedding,
             content="Test content for bug fix",
-            type="bug",
             tags=["test", "example"],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
-            quality_analysis=MagicMock(),
         )
 
     def test_add_and_retrieve_item(self, store, sample_item):
@@ -164,19 +261,11 @@ class TestPendingStore:
 
         assert result is False
 
-    def test_expired_item_returns_none(self, store):
+    def test_expired_item_returns_none(self, store, mock_embedding):
         """Items past TTL should return None."""
-        from pendomind.tools import PendingItem
-
-        expired_item = PendingItem(
-            id="expired-123",
-            content="Old content",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
-            quality_analysis=MagicMock(),
+        expired_item = _make_item(
+            "expired-123",
+            mock_embedding,
             created_at=_utc_now() - timedelta(minutes=60),
         )
         store.add(expired_item)
@@ -185,21 +274,17 @@ class TestPendingStore:
 
         assert result is None
 
-    def test_list_pending_returns_all_valid(self, store, sample_item):
+    def test_list_pending_returns_all_valid(self, store, sample_item, mock_embedding):
         """list_pending() should return all non-expired items."""
-        from pendomind.tools import PendingItem
-
         # Add two fresh items
         store.add(sample_item)
-        another_item = PendingItem(
-            id="test-456",
+        another_item = _make_item(
+            "test-456",
+            mock_embedding,
             content="Another content",
             type="feature",
             tags=["test"],
             source="confluence",
-            file_paths=None,
-            embedding=[0.1] * 1536,
-            quality_analysis=MagicMock(),
         )
         store.add(another_item)
 
@@ -210,53 +295,39 @@ class TestPendingStore:
         assert "test-123" in ids
         assert "test-456" in ids
 
-    def test_list_pending_excludes_expired(self, store, sample_item):
+    def test_list_pending_excludes_expired(self, store, sample_item, mock_embedding):
         """list_pending() should only return non-expired items."""
-        from pendomind.tools import PendingItem
-
         # Add fresh item
         store.add(sample_item)
 
-        # Add expired item directly to bypass add() validation
-        expired = PendingItem(
-            id="expired-123",
-            content="Old content",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
-            quality_analysis=MagicMock(),
+        # Add expired item
+        expired = _make_item(
+            "expired-123",
+            mock_embedding,
             created_at=_utc_now() - timedelta(minutes=60),
         )
-        store._items["expired-123"] = expired
+        store.add(expired)
 
         pending = store.list_pending()
 
         assert len(pending) == 1
         assert pending[0].id == "test-123"
 
-    def test_cleanup_expired_removes_old_items(self, store, sample_item):
+    def test_cleanup_expired_removes_old_items(
+        self, store, sample_item, mock_embedding
+    ):
         """cleanup_expired() should remove expired items."""
-        from pendomind.tools import PendingItem
-
         # Add fresh item
         store.add(sample_item)
 
-        # Add expired items directly
+        # Add expired items
         for i in range(3):
-            expired = PendingItem(
-                id=f"expired-{i}",
-                content="Old content",
-                type="bug",
-                tags=[],
-                source="github",
-                file_paths=None,
-                embedding=[0.1] * 1536,
-                quality_analysis=MagicMock(),
+            expired = _make_item(
+                f"expired-{i}",
+                mock_embedding,
                 created_at=_utc_now() - timedelta(minutes=60),
             )
-            store._items[f"expired-{i}"] = expired
+            store.add(expired)
 
         # Should have 4 items total
         assert len(store._items) == 4
@@ -269,83 +340,138 @@ class TestPendingStore:
         assert len(store._items) == 1
         assert "test-123" in store._items
 
-    def test_count_pending(self, store, sample_item):
-        """count() should return number of valid pending items."""
-        from pendomind.tools import PendingItem
+    def test_cleanup_expired_pops_only_due_entries(
+        self, store, sample_item, mock_embedding
+    ):
+        """Sweeps pop due heap entries and leave later deadlines in place."""
+        store.add(sample_item)
+        store.add(
+            _make_item(
+                "expired-123",
+                mock_embedding,
+                created_at=_utc_now() - timedelta(minutes=60),
+            )
+        )
 
+        assert store.cleanup_expired() == 1
+        assert store._expiry_heap == [(sample_item.expires_at, "test-123")]
+        assert store.cleanup_expired() == 0
+
+    def test_sweeps_skip_lock_when_nothing_due(self, store, sample_item):
+        """Expiry scans only lock when an item has come due."""
         store.add(sample_item)
-        another = PendingItem(
-            id="test-456",
-            content="Another",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
-            quality_analysis=MagicMock(),
+        store._lock = MagicMock()
+
+        assert store.cleanup_expired() == 0
+        assert store.count() == 1
+        assert store.list_pending() == [sample_item]
+        store._lock.__enter__.assert_not_called()
+
+    def test_stale_heap_entry_does_not_expire_readded_item(self, store, mock_embedding):
+        """A removed item's heap entry must not evict a re-added item."""
+        old = _make_item(
+            "test-123", mock_embedding, created_at=_utc_now() - timedelta(minutes=60)
         )
+        store.add(old)
+        store.remove("test-123")
+        fresh = _make_item("test-123", mock_embedding)
+        store.add(fresh)
+
+        assert store.cleanup_expired() == 0
+        assert store.get("test-123") is fresh
+
+    def test_expiry_heap_compacts_after_removals(self, store, sample_item):
+        """Entries left behind by remove() should not accumulate."""
+        for _ in range(500):
+            store.add(sample_item)
+            store.remove(sample_item.id)
+
+        assert len(store._expiry_heap) <= 2 * len(store._items) + 65
+
+    def test_count_pending(self, store, sample_item, mock_embedding):
+        """count() should return number of valid pending items."""
+        store.add(sample_item)
+        another = _make_item("test-456", mock_embedding, content="Another")
         store.add(another)
 
         assert store.count() == 2
 
-    def test_count_excludes_expired(self, store, sample_item):
+    def test_count_excludes_expired(self, store, sample_item, mock_embedding):
         """count() should not include expired items."""
-        from pendomind.tools import PendingItem
-
         store.add(sample_item)
 
-        # Add expired item directly
-        expired = PendingItem(
-            id="expired-123",
-            content="Old",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
-            quality_analysis=MagicMock(),
+        # Add expired item
+        expired = _make_item(
+            "expired-123",
+            mock_embedding,
             created_at=_utc_now() - timedelta(minutes=60),
         )
-        store._items["expired-123"] = expired
+        store.add(expired)
 
         assert store.count() == 1
 
     def test_store_uses_config_ttl(self):
         """Store should use TTL from config if provided."""
-        from pendomind.tools import PendingStore
-        from pendomind.config import PendoMindConfig
-
-        config = PendoMindConfig()
-        config.pending.ttl_minutes = 45
+        config = PendoMindConfig(pending=PendingConfig(ttl_minutes=45))
         store = PendingStore(config=config)
 
         assert store.ttl_minutes == 45
 
+    def test_wall_clock_jump_does_not_expire_items(
+        self, store, sample_item, monkeypatch
+    ):
+        """Expiry follows the monotonic clock, not wall-clock steps."""
+        store.add(sample_item)
+        wall_now = time.time()
+        monkeypatch.setattr(time, "time", lambda: wall_now + 2 * 3600)
+
+        assert sample_item.is_expired() is False
+        assert store.count() == 1
+
+    def test_add_applies_store_ttl(self, mock_embedding):
+        """add() should recompute expires_at under the store's TTL."""
+        store = PendingStore(ttl_minutes=5)
+        item = _make_item(
+            "test-123",
+            mock_embedding,
+            created_at=_utc_now() - timedelta(minutes=10),
+        )
+        store.add(item)
+
+        assert item.expires_at == item._created_monotonic + 5 * 60
+        assert store.get("test-123") is None
+
     def test_store_overrides_config_ttl(self):
         """Explicit TTL should override config TTL."""
-        from pendomind.tools import PendingStore
-        from pendomind.config import PendoMindConfig
-
-        config = PendoMindConfig()
-        config.pending.ttl_minutes = 45
+        config = PendoMindConfig(pending=PendingConfig(ttl_minutes=45))
         store = PendingStore(ttl_minutes=60, config=config)
 
         assert store.ttl_minutes == 60
 
-    def test_add_generates_id_if_not_provided(self, store):
-        """Add should work with items that need ID generation."""
-        from pendomind.tools import PendingItem
+    def test_store_uses_config_max_items(self):
+        """Store should take its size cap from config unless overridden."""
+        config = PendoMindConfig(pending=PendingConfig(max_items=10))
 
-        item = PendingItem(
-            id="",  # Empty ID
-            content="Test content",
-            type="bug",
-            tags=[],
-            source="github",
-            file_paths=None,
-            embedding=[0.1] * 1536,
-            quality_analysis=MagicMock(),
-        )
+        assert PendingStore(config=config).max_items == 10
+        assert PendingStore(config=config, max_items=5).max_items == 5
+        assert PendingStore().max_items == 1000
+
+    def test_add_evicts_least_recently_used(self, mock_embedding):
+        """Past max_items, the least recently added or read item goes."""
+        store = PendingStore(max_items=2)
+        for item_id in ("first", "second"):
+            store.add(_make_item(item_id, mock_embedding))
+        store.get("first")  # refresh "first"
+        store.add(_make_item("third", mock_embedding))
+
+        assert store.count() == 2
+        assert store.get("second") is None
+        assert store.get("first") is not None
+        assert store.get("third") is not None
+
+    def test_add_generates_id_if_not_provided(self, store, mock_embedding):
+        """Add should work with items that need ID generation."""
+        item = _make_item("", mock_embedding)
 
         generated_id = store.add(item)
 
@@ -353,15 +479,97 @@ class TestPendingStore:
         assert len(generated_id) > 0
         assert store.get(generated_id) is not None
 
+    def test_concurrent_cleanups_do_not_race(self, store, mock_embedding):
+        """Concurrent cleanups should each remove items without errors."""
+        for i in range(200):
+            store.add(
+                _make_item(
+                    f"expired-{i}",
+                    mock_embedding,
+                    created_at=_utc_now() - timedelta(minutes=60),
+                )
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            removed = list(pool.map(lambda _: store.cleanup_expired(), range(8)))
+
+        assert sum(removed) == 200
+        assert store.count() == 0
+
+    def test_lock_free_reads_during_heap_rebuild(self, mock_embedding):
+        """get() reordering _items must not break add()'s heap rebuild."""
+        store = PendingStore(max_items=5000)
+        for i in range(500):
+            store.add(_make_item(f"keep-{i}", mock_embedding))
+        done = threading.Event()
+        errors = []
+
+        def read():
+            while not done.is_set():
+                for i in range(0, 500, 7):
+                    store.get(f"keep-{i}")
+
+        def write():
+            try:
+                for i in range(3000):
+                    store.add(_make_item("churn", mock_embedding))
+                    store.remove("churn")
+            except RuntimeError as exc:
+                errors.append(exc)
+            finally:
+                done.set()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        threads.append(threading.Thread(target=write))
+
+        # Switch threads often, so readers run inside the rebuild
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+
+    def test_small_store_does_not_start_sweep(self, store, sample_item):
+        """Stores below the sweep threshold rely on lazy expiry only."""
+        store.add(sample_item)
+
+        assert store._sweep_task is None
+
+    async def test_background_sweep_removes_expired_items(self, mock_embedding):
+        """Large stores should shed expired items without a read."""
+        store = PendingStore(ttl_minutes=1)
+        for i in range(PendingStore.SWEEP_THRESHOLD + 10):
+            store.add(
+                _make_item(
+                    f"old-{i}",
+                    mock_embedding,
+                    created_at=_utc_now() - timedelta(minutes=5),
+                )
+            )
+
+        assert store._sweep_task is not None
+
+        await asyncio.wait_for(store._sweep_task, timeout=2)
+
+        assert len(store._items) == 0
+        assert store._sweep_task is None
+        assert store._expiry_heap == []
+
 
 class TestSearchTool:
     """Test the search MCP tool."""
 
     @pytest.fixture
-    def mock_kb(self):
+    def mock_kb(self, mock_embedding):
         """Mock knowledge base."""
         mock_instance = MagicMock()
-        mock_instance.get_embedding = AsyncMock(return_value=[0.1] * 1536)
+        mock_instance.get_embedding_batched = AsyncMock(return_value=mock_embedding)
         mock_instance.search = AsyncMock(
             return_value=[
                 {
@@ -384,33 +592,24 @@ class TestSearchTool:
         )
         return mock_instance
 
-    @pytest.mark.asyncio
     async def test_search_returns_results(self, mock_kb):
         """search() should return formatted search results."""
-        from pendomind.tools import search
-
         results = await search("database timeout", kb=mock_kb)
 
         assert len(results) == 2
         assert results[0]["id"] == "result-1"
         assert results[0]["score"] == 0.95
 
-    @pytest.mark.asyncio
     async def test_search_with_type_filter(self, mock_kb):
         """search() should pass type filter to KB."""
-        from pendomind.tools import search
-
         await search("database", type_filter="incident", kb=mock_kb)
 
         mock_kb.search.assert_called_once()
         call_kwargs = mock_kb.search.call_args[1]
         assert call_kwargs["type_filter"] == "incident"
 
-    @pytest.mark.asyncio
     async def test_search_respects_limit(self, mock_kb):
         """search() should pass limit to KB."""
-        from pendomind.tools import search
-
         await search("query", limit=5, kb=mock_kb)
 
         call_kwargs = mock_kb.search.call_args[1]
@@ -433,11 +632,8 @@ class TestRememberTool:
         )
         return mock
 
-    @pytest.mark.asyncio
     async def test_remember_uses_middleware(self, mock_middleware):
         """remember() should use quality middleware for processing."""
-        from pendomind.tools import remember
-
         result = await remember(
             content="Fixed the database connection pool exhaustion issue by increasing pool size from 10 to 50 and adding connection timeout handling.",
             type="bug",
@@ -449,7 +645,6 @@ class TestRememberTool:
         mock_middleware.process.assert_called_once()
         assert result["status"] == "stored"
 
-    @pytest.mark.asyncio
     async def test_remember_returns_pending(self, mock_middleware):
         """remember() should return pending status for medium quality."""
         mock_middleware.process = AsyncMock(
@@ -461,8 +656,6 @@ class TestRememberTool:
             }
         )
 
-        from pendomind.tools import remember
-
         result = await remember(
             content="Fixed authentication issue.",
             type="bug",
@@ -474,7 +667,6 @@ class TestRememberTool:
         assert result["status"] == "pending"
         assert result["pending_id"] == "pending-456"
 
-    @pytest.mark.asyncio
     async def test_remember_returns_rejected(self, mock_middleware):
         """remember() should return rejected status for low quality."""
         mock_middleware.process = AsyncMock(
@@ -485,8 +677,6 @@ class TestRememberTool:
             }
         )
 
-        from pendomind.tools import remember
-
         result = await remember(
             content="Fixed bug.",
             type="bug",
@@ -502,21 +692,16 @@ class TestRememberConfirmTool:
     """Test the remember_confirm MCP tool."""
 
     @pytest.fixture
-    def mock_pending_store(self):
+    def mock_pending_store(self, mock_embedding):
         """Mock pending store with item."""
-        from pendomind.tools import PendingItem
-
         mock = MagicMock()
         mock.get = MagicMock(
-            return_value=PendingItem(
-                id="pending-123",
+            return_value=_make_item(
+                "pending-123",
+                mock_embedding,
                 content="Test content for storage",
-                type="bug",
                 tags=["test"],
-                source="github",
                 file_paths=["src/api.py"],
-                embedding=[0.1] * 1536,
-                quality_analysis=MagicMock(),
             )
         )
         mock.remove = MagicMock(return_value=True)
@@ -529,11 +714,8 @@ class TestRememberConfirmTool:
         mock.store = AsyncMock(return_value="stored-789")
         return mock
 
-    @pytest.mark.asyncio
     async def test_confirm_approve_stores_content(self, mock_pending_store, mock_kb):
         """Approving should store content in KB."""
-        from pendomind.tools import remember_confirm
-
         result = await remember_confirm(
             pending_id="pending-123",
             approved=True,
@@ -545,13 +727,25 @@ class TestRememberConfirmTool:
         mock_pending_store.remove.assert_called_with("pending-123")
         assert result["status"] == "stored"
 
-    @pytest.mark.asyncio
+    async def test_confirm_passes_embedding_array_unchanged(
+        self, mock_pending_store, mock_kb
+    ):
+        """Approving should hand the pending float32 embedding to the KB as-is."""
+        item = mock_pending_store.get.return_value
+
+        await remember_confirm(
+            pending_id="pending-123",
+            approved=True,
+            pending_store=mock_pending_store,
+            kb=mock_kb,
+        )
+
+        assert mock_kb.store.call_args[1]["embedding"] is item.embedding
+
     async def test_confirm_reject_removes_from_pending(
         self, mock_pending_store, mock_kb
     ):
         """Rejecting should remove from pending without storing."""
-        from pendomind.tools import remember_confirm
-
         result = await remember_confirm(
             pending_id="pending-123",
             approved=False,
@@ -563,11 +757,8 @@ class TestRememberConfirmTool:
         mock_pending_store.remove.assert_called_with("pending-123")
         assert result["status"] == "rejected"
 
-    @pytest.mark.asyncio
     async def test_confirm_expired_returns_error(self, mock_kb):
         """Confirming expired item should return error."""
-        from pendomind.tools import remember_confirm, PendingStore
-
         mock_store = MagicMock()
         mock_store.get = MagicMock(return_value=None)  # Not found (expired)
 
@@ -581,15 +772,72 @@ class TestRememberConfirmTool:
         assert result["status"] == "error"
         assert "not found" in result["message"].lower()
 
+    async def test_confirm_without_store_uses_shared_default(
+        self, mock_kb, mock_embedding
+    ):
+        """Without an injected store, confirm should see items in the default store."""
+        pending_id = shared_pending_store().add(
+            _make_item("", mock_embedding, content="Shared store content")
+        )
+
+        result = await remember_confirm(
+            pending_id=pending_id, approved=True, kb=mock_kb
+        )
+
+        assert result["status"] == "stored"
+        assert shared_pending_store() is shared_pending_store()
+        assert shared_pending_store().get(pending_id) is None
+
+    def test_shared_store_follows_pending_config(self):
+        """Each pending config section gets its own shared store and settings."""
+        custom = PendoMindConfig(pending=PendingConfig(ttl_minutes=5, max_items=10))
+
+        store = shared_pending_store(custom)
+
+        assert store is shared_pending_store(custom)
+        assert store is not shared_pending_store()
+        assert (store.ttl_minutes, store.max_items) == (5, 10)
+        assert shared_pending_store(PendoMindConfig()) is shared_pending_store()
+
+    async def test_remember_then_confirm_without_injected_store(
+        self, mock_kb, mock_embedding
+    ):
+        """A pending item from a default remember() is confirmable by default."""
+        analysis = MagicMock(composite_score=0.75, recommendations=[])
+        with (
+            patch(
+                "pendomind.middleware.QualityScorer",
+                return_value=FakeScorer(analysis),
+            ),
+            patch(
+                "pendomind.middleware.KnowledgeBase",
+                return_value=FakeKnowledgeBase(mock_embedding),
+            ),
+        ):
+            pending = await remember(
+                content="Fixed the connection pool leak by closing cursors in the "
+                "retry handler after each failed query attempt",
+                type="bug",
+                tags=["database"],
+            )
+
+        assert pending["status"] == "pending"
+
+        result = await remember_confirm(
+            pending_id=pending["pending_id"], approved=True, kb=mock_kb
+        )
+
+        assert result["status"] == "stored"
+
 
 class TestRecallTool:
     """Test the recall MCP tool."""
 
     @pytest.fixture
-    def mock_kb(self):
+    def mock_kb(self, mock_embedding):
         """Mock knowledge base."""
         mock = MagicMock()
-        mock.get_embedding = AsyncMock(return_value=[0.1] * 1536)
+        mock.get_embedding_batched = AsyncMock(return_value=mock_embedding)
         mock.search = AsyncMock(
             return_value=[
                 {
@@ -603,22 +851,16 @@ class TestRecallTool:
         )
         return mock
 
-    @pytest.mark.asyncio
     async def test_recall_returns_formatted_context(self, mock_kb):
         """recall() should return formatted context from KB."""
-        from pendomind.tools import recall
-
         result = await recall("database connection issues", kb=mock_kb)
 
         assert "entries" in result
         assert len(result["entries"]) == 1
         assert result["entries"][0]["content"].startswith("Database")
 
-    @pytest.mark.asyncio
     async def test_recall_with_type_filter(self, mock_kb):
         """recall() should filter by type."""
-        from pendomind.tools import recall
-
         await recall("query", type_filter="incident", kb=mock_kb)
 
         call_kwargs = mock_kb.search.call_args[1]
@@ -629,10 +871,10 @@ class TestListSimilarTool:
     """Test the list_similar MCP tool."""
 
     @pytest.fixture
-    def mock_kb(self):
+    def mock_kb(self, mock_embedding):
         """Mock knowledge base."""
         mock = MagicMock()
-        mock.get_embedding = AsyncMock(return_value=[0.1] * 1536)
+        mock.get_embedding_batched = AsyncMock(return_value=mock_embedding)
         mock.find_duplicates = AsyncMock(
             return_value=[
                 {
@@ -645,11 +887,8 @@ class TestListSimilarTool:
         )
         return mock
 
-    @pytest.mark.asyncio
     async def test_list_similar_finds_duplicates(self, mock_kb):
         """list_similar() should return potential duplicates."""
-        from pendomind.tools import list_similar
-
         result = await list_similar(
             "Fixed database connection timeout issue", kb=mock_kb
         )
@@ -657,13 +896,10 @@ class TestListSimilarTool:
         assert len(result) == 1
         assert result[0]["similarity_score"] == 0.95
 
-    @pytest.mark.asyncio
     async def test_list_similar_empty_when_unique(self, mock_kb):
         """list_similar() should return empty list for unique content."""
         mock_kb.find_duplicates = AsyncMock(return_value=[])
 
-        from pendomind.tools import list_similar
-
         result = await list_similar("Completely unique content here", kb=mock_kb)
 
         assert len(result) == 0
@@ -694,24 +930,18 @@ class TestGetContextTool:
         )
         return mock
 
-    @pytest.mark.asyncio
     async def test_get_context_returns_file_related_entries(self, mock_kb):
         """get_context() should return knowledge related to file."""
-        from pendomind.tools import get_context
-
         result = await get_context("src/api.py", kb=mock_kb)
 
         assert "entries" in result
         assert len(result["entries"]) == 2
         mock_kb.get_by_file_path.assert_called_with("src/api.py")
 
-    @pytest.mark.asyncio
     async def test_get_context_empty_for_new_file(self, mock_kb):
         """get_context() should return empty for files with no entries."""
         mock_kb.get_by_file_path = AsyncMock(return_value=[])
 
-        from pendomind.tools import get_context
-
         result = await get_context("new/file.py", kb=mock_kb)
 
         assert result["entries"] == []
@@ -748,11 +978,8 @@ class TestListAllTool:
         )
         return mock
 
-    @pytest.mark.asyncio
     async def test_list_all_returns_formatted_entries(self, mock_kb):
         """list_all() should return entries with summaries."""
-        from pendomind.tools import list_all
-
         results = await list_all(kb=mock_kb)
 
         assert len(results) == 2
@@ -761,56 +988,41 @@ class TestListAllTool:
         assert results[0]["tags"] == ["database", "production"]
         assert results[0]["source"] == "github"
 
-    @pytest.mark.asyncio
     async def test_list_all_truncates_long_content(self, mock_kb):
         """list_all() should truncate content to 150 chars with ellipsis."""
-        from pendomind.tools import list_all
-
         results = await list_all(kb=mock_kb)
 
         # First entry has content > 150 chars
         assert len(results[0]["summary"]) == 153  # 150 + "..."
         assert results[0]["summary"].endswith("...")
 
-    @pytest.mark.asyncio
     async def test_list_all_keeps_short_content(self, mock_kb):
         """list_all() should keep short content as-is."""
-        from pendomind.tools import list_all
-
         results = await list_all(kb=mock_kb)
 
         # Second entry has short content
         assert results[1]["summary"] == "Short note"
         assert not results[1]["summary"].endswith("...")
 
-    @pytest.mark.asyncio
     async def test_list_all_with_type_filter(self, mock_kb):
         """list_all() should pass type filter to KB."""
-        from pendomind.tools import list_all
-
         await list_all(type_filter="bug", kb=mock_kb)
 
         mock_kb.get_all.assert_called_once()
         call_kwargs = mock_kb.get_all.call_args[1]
         assert call_kwargs["type_filter"] == "bug"
 
-    @pytest.mark.asyncio
     async def test_list_all_respects_limit(self, mock_kb):
         """list_all() should pass limit to KB."""
-        from pendomind.tools import list_all
-
         await list_all(limit=50, kb=mock_kb)
 
         call_kwargs = mock_kb.get_all.call_args[1]
         assert call_kwargs["limit"] == 50
 
-    @pytest.mark.asyncio
     async def test_list_all_empty_kb(self, mock_kb):
         """list_all() should return empty list for empty KB."""
         mock_kb.get_all = AsyncMock(return_value=[])
 
-        from pendomind.tools import list_all
-
         results = await list_all(kb=mock_kb)
 
         assert results == []
@@ -836,11 +1048,8 @@ class TestUpdateTool:
         )
         return mock
 
-    @pytest.mark.asyncio
     async def test_update_calls_kb_update(self, mock_kb):
         """update() should delegate to kb.update()."""
-        from pendomind.tools import update
-
         result = await update(
             id="entry-123",
             content="Updated content",
@@ -857,11 +1066,8 @@ class TestUpdateTool:
         assert result["id"] == "entry-123"
         assert result["content"] == "Updated content"
 
-    @pytest.mark.asyncio
     async def test_update_with_all_fields(self, mock_kb):
         """update() should pass all fields to kb.update()."""
-        from pendomind.tools import update
-
         await update(
             id="entry-123",
             content="New content",
@@ -890,11 +1096,8 @@ class TestDeleteTool:
         mock.delete = AsyncMock()
         return mock
 
-    @pytest.mark.asyncio
     async def test_delete_calls_kb_delete(self, mock_kb):
         """delete() should delegate to kb.delete()."""
-        from pendomind.tools import delete
-
         result = await delete(id="entry-123", kb=mock_kb)
 
         mock_kb.delete.assert_called_once_with("entry-123")
@@ -906,10 +1109,10 @@ class TestUpsertTool:
     """Test the upsert (smart update-or-create) MCP tool."""
 
     @pytest.fixture
-    def mock_kb(self):
+    def mock_kb(self, mock_embedding):
         """Mock knowledge base."""
         mock = MagicMock()
-        mock.get_embedding = AsyncMock(return_value=[0.1] * 384)
+        mock.get_embedding_batched = AsyncMock(return_value=mock_embedding)
         mock.find_duplicates = AsyncMock(return_value=[])
         mock.store = AsyncMock(return_value="new-entry-123")
         mock.update = AsyncMock(
@@ -925,13 +1128,10 @@ class TestUpsertTool:
         )
         return mock
 
-    @pytest.mark.asyncio
     async def test_upsert_creates_new_when_no_similar(self, mock_kb):
         """upsert() should create new entry when no similar found."""
         mock_kb.find_duplicates = AsyncMock(return_value=[])
 
-        from pendomind.tools import upsert
-
         result = await upsert(
             content="Brand new incident investigation",
             type="incident",
@@ -944,7 +1144,6 @@ class TestUpsertTool:
         assert result["status"] == "created"
         assert result["id"] == "new-entry-123"
 
-    @pytest.mark.asyncio
     async def test_upsert_updates_when_similar_found(self, mock_kb):
         """upsert() should update existing entry when similar found."""
         mock_kb.find_duplicates = AsyncMock(
@@ -958,8 +1157,6 @@ class TestUpsertTool:
             ]
         )
 
-        from pendomind.tools import upsert
-
         result = await upsert(
             content="Updated incident with resolution",
             type="incident",
@@ -974,11 +1171,8 @@ class TestUpsertTool:
         assert result["id"] == "existing-456"
         assert result["previous_similarity"] == 0.92
 
-    @pytest.mark.asyncio
     async def test_upsert_uses_similarity_threshold(self, mock_kb):
         """upsert() should use the provided similarity threshold."""
-        from pendomind.tools import upsert
-
         await upsert(
             content="Content to check",
             type="bug",
@@ -991,7 +1185,6 @@ class TestUpsertTool:
         call_args = mock_kb.find_duplicates.call_args
         assert call_args[1]["threshold"] == 0.80
 
-    @pytest.mark.asyncio
     async def test_upsert_updates_most_similar(self, mock_kb):
         """upsert() should update the most similar entry (first in list)."""
         mock_kb.find_duplicates = AsyncMock(
@@ -1020,8 +1213,6 @@ class TestUpsertTool:
             }
         )
 
-        from pendomind.tools import upsert
-
         result = await upsert(
             content="Updated content",
             type="incident",